@@ -1,5 +1,14 @@
 from classes import ResumeRankingSystem, JobDescription
-system = ResumeRankingSystem()
+from cache import DEFAULT_JD_CACHE_PATH, ExtractionCache
+system = ResumeRankingSystem(cache=ExtractionCache())
+jd_cache = ExtractionCache(DEFAULT_JD_CACHE_PATH, max_entries=1000, max_age_days=1)
+
+
+def use_candidate_index():
+    # Opened on first use so the menu shows up without loading numpy
+    if system.candidate_index is None:
+        from candidate_index import CandidateIndex
+        system.candidate_index = CandidateIndex()
 
 while True:
         print("\n===== Transparent Resume Ranking System =====")
@@ -9,12 +18,13 @@ while True:
         print("4. Show Sorted Results")
         print("5. Reset System")
         print("6. Exit")
+        print("7. Rank Stored Candidates")
 
         choice = input("Select an option: ")
 
         if choice == "1":
             if system.job is None:
-                system.job = JobDescription()
+                system.job = JobDescription(metrics=system.metrics, cache=jd_cache, caller=system.llm)
             
             print("\nPaste the Job Description text below (end with empty line):")
             lines = []
@@ -31,6 +41,7 @@ while True:
            print("\nEnter path(s) to PDF resume(s), separated by commas:")
            paths = input().split(",")
            paths = [p.strip() for p in paths if p.strip()]
+           use_candidate_index()
            system.process_resumes(paths)
 
         elif choice == "3":
@@ -50,6 +61,14 @@ while True:
             print("Exiting system.")
             break
 
+        elif choice == "7":
+            try:
+                use_candidate_index()
+                system.rank_stored_candidates(k=20)
+                system.show_sorted_results()
+            except Exception as e:
+                print(e)
+
         else:
             print("Invalid option. Try again.")
 
@@ -0,0 +1,354 @@
+# batch.py
+# Non-interactive batch ranking: one job description file plus a directory,
+# glob or list of PDFs in, ranked CSV or JSONL out. Meant for cron jobs.
+#
+#   python CLI-Version/batch.py --jd job.txt resumes/ -o ranked.csv \
+#       --workers 8 --checkpoint run.ckpt --resume
+#
+# Exit codes: 0 all resumes ranked, 1 ranked with some resumes failed,
+# 2 bad arguments or no input files, 3 nothing could be ranked.
+import os
+import sys
+import csv
+import glob
+import json
+import argparse
+import contextlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from classes import EXTRACTION_MODES, JobDescription, Resume, ResumeError, ResumeRankingSystem
+from cache import DEFAULT_JD_CACHE_PATH, ExtractionCache
+from dedup import DEFAULT_THRESHOLD as DEDUP_THRESHOLD
+from fuzzy import DEFAULT_THRESHOLD as FUZZY_THRESHOLD
+from scoring import EXPERIENCE_CAP, SKILL_WEIGHT
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_USAGE = 2
+EXIT_FAILED = 3
+
+OUTPUT_FIELDS = [
+    "rank", "candidate", "path", "final_score", "skill_match_pct", "exp_score_pct",
+    "experience_years", "matched_skills", "missing_skills", "missing_must_have", "duplicates",
+]
+
+
+def collect_pdfs(inputs):
+    # Directories are searched recursively, anything else is a file or glob.
+    # Duplicates are dropped and the order is stable so reruns line up.
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, "**", "*.pdf"), recursive=True)
+            matches += glob.glob(os.path.join(item, "**", "*.PDF"), recursive=True)
+        elif glob.has_magic(item):
+            matches = glob.glob(item, recursive=True)
+        elif os.path.isfile(item):
+            matches = [item]
+        else:
+            print(f"⚠️ Skipping {item}: no such file or directory", file=sys.stderr)
+            matches = []
+        paths.extend(sorted(matches))
+    return list(dict.fromkeys(os.path.normpath(p) for p in paths))
+
+
+class Checkpoint:
+    # Append-only JSONL log of finished work. The first line holds the
+    # extracted job description, every other line one extracted resume, so
+    # a restarted run skips the JD call and every resume already done.
+    def __init__(self, path):
+        self.path = path
+        self.job = None
+        self.done = {}
+        self._file = None
+        self._torn = False
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.read().split("\n")
+        # A line cut off by a crash is dropped and later appends start on a fresh line
+        self._torn = bool(lines[-1])
+        for line in lines:
+            if line:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if "job" in entry:
+                    self.job = entry["job"]
+                elif "path" in entry:
+                    self.done[entry["path"]] = entry
+
+    def _write(self, entry):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+            if self._torn:
+                self._file.write("\n")
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def start(self, job):
+        # A fresh run truncates any old log before writing the JD line
+        with open(self.path, "w", encoding="utf-8"):
+            pass
+        self.job, self.done, self._torn = job, {}, False
+        self._write({"job": job})
+
+    def add(self, resume):
+        entry = {"path": resume.name, "skills": resume.skills, "experience": resume.experience}
+        if resume.duplicate_of is not None:
+            entry["duplicate_of"] = resume.duplicate_of
+        self.done[resume.name] = entry
+        self._write(entry)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def result_rows(ranked):
+    return [
+        {
+            "rank": i,
+            "candidate": os.path.basename(r.name),
+            "path": r.name,
+            "final_score": r.score,
+            "skill_match_pct": r.skill_match_pct,
+            "exp_score_pct": r.exp_score_pct,
+            "experience_years": r.experience,
+            "matched_skills": r.matched_skills,
+            "missing_skills": r.missing_skills,
+            "missing_must_have": r.missing_must_have,
+            "duplicates": r.duplicates,
+        }
+        for i, r in enumerate(ranked, start=1)
+    ]
+
+
+def write_results(rows, out, fmt):
+    if fmt == "jsonl":
+        for row in rows:
+            out.write(json.dumps(row) + "\n")
+        return
+
+    writer = csv.DictWriter(out, fieldnames=OUTPUT_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({
+            **row,
+            "matched_skills": ", ".join(row["matched_skills"]),
+            "missing_skills": ", ".join(row["missing_skills"]),
+            "missing_must_have": ", ".join(row["missing_must_have"]),
+            "duplicates": ", ".join(row["duplicates"]),
+        })
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rank a batch of PDF resumes against a job description.")
+    parser.add_argument("inputs", nargs="+", help="PDF files, directories or glob patterns")
+    parser.add_argument("--jd", required=True, help="text file with the job description ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=["csv", "jsonl"],
+                        help="output format (default: from the output extension, else csv)")
+    parser.add_argument("--workers", type=int, default=4, help="resumes extracted in parallel")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="PDF parsing processes (default: CPU count, 0 = parse in a thread)")
+    parser.add_argument("--rpm", type=int, default=None, help="cap on LLM requests per minute")
+    parser.add_argument("--batch-tokens", type=int, default=None,
+                        help="pack several resumes per request up to this many tokens")
+    parser.add_argument("--compact", action="store_true",
+                        help="send the model only the skills/experience/summary/projects sections")
+    parser.add_argument("--prompt-tokens", type=int, default=None,
+                        help="with --compact, cap each resume at this many estimated tokens")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds before an LLM call is retried")
+    parser.add_argument("--retries", type=int, default=2, help="retries per LLM call, with jittered backoff")
+    parser.add_argument("--hedge-percentile", type=float, default=None,
+                        help="send a duplicate request once a call is slower than this latency percentile")
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="hard limit in seconds for extracting the whole batch")
+    parser.add_argument("--mode", choices=EXTRACTION_MODES, default="llm",
+                        help="skill extraction mode; local also reads the job description offline")
+    parser.add_argument("--top-k", type=int, default=None, help="only write the best K candidates")
+    parser.add_argument("--min-score", type=float, default=None, help="only write candidates scoring at least this")
+    parser.add_argument("--skill-weight", type=float, default=SKILL_WEIGHT,
+                        help="weight of the skill match, 0-1; experience gets the rest")
+    parser.add_argument("--experience-cap", type=float, default=EXPERIENCE_CAP,
+                        help="highest experience score, in %% of the required years")
+    parser.add_argument("--must-have", action="append", default=[],
+                        help="comma-separated skills; candidates missing any rank last (repeatable)")
+    parser.add_argument("--fuzzy", nargs="?", type=float, const=FUZZY_THRESHOLD, default=None,
+                        metavar="THRESHOLD",
+                        help=f"also match similar skill names (n-gram similarity, default {FUZZY_THRESHOLD})")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="rank repeated resumes separately instead of grouping them")
+    parser.add_argument("--dedup-threshold", nargs="?", type=float, const=DEDUP_THRESHOLD, default=None,
+                        metavar="THRESHOLD",
+                        help="also group near-identical resumes listing the same skills "
+                             f"(MinHash similarity, default {DEDUP_THRESHOLD}); off by default")
+    parser.add_argument("--checkpoint", help="JSONL file recording finished resumes")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue from --checkpoint, skipping resumes it already holds")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the extraction cache")
+    parser.add_argument("--metrics-log", help="append per-batch stage timings and token counts (JSON lines)")
+    parser.add_argument("--metrics-file", help="write metrics in Prometheus text format to this file")
+    args = parser.parse_args(argv)
+
+    if args.resume and not args.checkpoint:
+        parser.error("--resume needs --checkpoint")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if not 0 <= args.skill_weight <= 1:
+        parser.error("--skill-weight must be between 0 and 1")
+    if args.fuzzy is not None and not 0 < args.fuzzy <= 1:
+        parser.error("--fuzzy threshold must be above 0 and at most 1")
+    if args.dedup_threshold is not None and not 0 < args.dedup_threshold <= 1:
+        parser.error("--dedup-threshold must be above 0 and at most 1")
+    if args.format is None:
+        args.format = "jsonl" if args.output.endswith((".jsonl", ".ndjson")) else "csv"
+    return args
+
+
+def run(args):
+    # All progress output goes to stderr so stdout stays clean for results
+    log = sys.stderr
+
+    paths = collect_pdfs(args.inputs)
+    if not paths:
+        print("❌ No PDF files found.", file=log)
+        return EXIT_USAGE
+
+    try:
+        if args.jd == "-":
+            jd_text = sys.stdin.read()
+        else:
+            with open(args.jd, encoding="utf-8") as f:
+                jd_text = f.read()
+    except OSError as e:
+        print(f"❌ Could not read job description: {e}", file=log)
+        return EXIT_USAGE
+
+    system = ResumeRankingSystem(
+        concurrency=args.workers,
+        requests_per_minute=args.rpm,
+        cache=None if args.no_cache else ExtractionCache(),
+        batch_token_budget=args.batch_tokens,
+        parse_workers=args.parse_workers,
+        extraction_mode=args.mode,
+        metrics_log=args.metrics_log,
+        metrics_file=args.metrics_file,
+        compact_prompts=args.compact,
+        prompt_token_budget=args.prompt_tokens,
+        request_timeout=args.timeout,
+        max_retries=args.retries,
+        hedge_percentile=args.hedge_percentile,
+        batch_deadline=args.deadline,
+        dedup=not args.no_dedup,
+        dedup_threshold=args.dedup_threshold,
+    )
+    jd_cache = None if args.no_cache else ExtractionCache(DEFAULT_JD_CACHE_PATH, max_entries=1000, max_age_days=1)
+    system.job = JobDescription(metrics=system.metrics, cache=jd_cache, caller=system.llm)
+
+    checkpoint = Checkpoint(args.checkpoint) if args.checkpoint else None
+    if checkpoint is not None and args.resume:
+        checkpoint.load()
+        if checkpoint.job is not None and checkpoint.job["raw_text"] != jd_text.strip():
+            print("❌ Checkpoint was written for a different job description.", file=log)
+            return EXIT_USAGE
+
+    failed = 0
+    try:
+        with contextlib.redirect_stdout(log):
+            if checkpoint is not None and checkpoint.job is not None:
+                system.job.raw_text = checkpoint.job["raw_text"]
+                system.job.skills = checkpoint.job["skills"]
+                system.job.required_experience = checkpoint.job["required_experience"]
+                print(f"Resuming: {len(checkpoint.done)} resumes already extracted")
+            else:
+                if args.mode == "local":
+                    # Nothing in a local run goes to the LLM, the JD included
+                    system.job.process_text_local(jd_text, system.skill_extractor)
+                else:
+                    system.job.process_text(jd_text)
+                if not system.job.skills and not system.job.required_experience:
+                    print("❌ No requirements extracted from the job description.")
+                    return EXIT_FAILED
+                if checkpoint is not None:
+                    checkpoint.start({
+                        "raw_text": system.job.raw_text,
+                        "skills": system.job.skills,
+                        "required_experience": system.job.required_experience,
+                    })
+
+            todo, copies = [], []
+            for path in paths:
+                entry = checkpoint.done.get(path) if checkpoint is not None else None
+                if entry is None:
+                    # The path doubles as the candidate name so results map back to files
+                    todo.append((path, path))
+                elif entry.get("duplicate_of"):
+                    copies.append((path, entry["duplicate_of"]))
+                else:
+                    system.resumes.append(Resume(path, entry["skills"], entry["experience"]))
+
+            # Checkpointed duplicates go back under their original
+            restored = {r.name: r for r in system.resumes}
+            for path, original in copies:
+                if original in restored:
+                    restored[original].duplicates.append(path)
+                else:
+                    todo.append((path, path))
+
+            if todo:
+                for done, item in enumerate(system.iter_process_resumes(todo), start=1):
+                    if isinstance(item, ResumeError):
+                        failed += 1
+                    elif checkpoint is not None:
+                        checkpoint.add(item)
+                    print(f"[{done}/{len(todo)}] {failed} failed so far")
+
+            if not system.resumes:
+                print("❌ No resumes could be processed.")
+                return EXIT_FAILED
+
+            system.configure_scoring(
+                skill_weight=args.skill_weight, experience_weight=1 - args.skill_weight,
+                experience_cap=args.experience_cap,
+                must_have=[s.strip() for item in args.must_have for s in item.split(",") if s.strip()],
+                fuzzy=args.fuzzy is not None, fuzzy_threshold=args.fuzzy
+            )
+            ranked = system.top_k(args.top_k or len(system.resumes), min_score=args.min_score)
+            if args.metrics_file:
+                # Refreshed so the file includes the scoring stage
+                system.metrics.write_prometheus(args.metrics_file)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+        if system.cache is not None:
+            system.cache.close()
+        if jd_cache is not None:
+            jd_cache.close()
+
+    rows = result_rows(ranked)
+    if args.output == "-":
+        write_results(rows, sys.stdout, args.format)
+    else:
+        # Written next to the target and renamed, so a crash never leaves half a file
+        tmp_path = args.output + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="") as out:
+            write_results(rows, out, args.format)
+        os.replace(tmp_path, args.output)
+
+    print(f"✅ Ranked {len(system.resumes)} resumes, wrote {len(rows)} rows ({failed} failed).", file=log)
+    return EXIT_PARTIAL if failed else EXIT_OK
+
+
+def main(argv=None):
+    return run(parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# bench_compaction.py
+# Prompt tokens and response latency with and without section compaction
+# on the test_data resumes. Uses the live Groq API when GROQ_API_KEY is set,
+# otherwise FakeGroq with a per-token latency model.
+#
+#   python benchmarks/bench_compaction.py [--budget 600] [--repeat 3]
+import io
+import os
+import sys
+import argparse
+import contextlib
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from classes import JobDescription, ResumeRankingSystem
+from llm import get_client
+from fake_groq import FakeGroq
+
+# The key may live in .env, which the app only reads when it builds a client
+load_dotenv()
+
+
+def run(pdfs, client, compact, budget, repeat):
+    # Returns {name: (prompt tokens, mean seconds per call, skills)}
+    results = {}
+    for pdf in pdfs:
+        system = ResumeRankingSystem(
+            compact_prompts=compact, prompt_token_budget=budget, parse_workers=0, client=client
+        )
+        system.job = JobDescription(metrics=system.metrics, client=client)
+        resumes = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(repeat):
+                resumes = system.process_resumes([str(pdf)]) or resumes
+        summary = system.metrics.summary()
+        llm = summary["stages"].get("llm", {"seconds": 0.0, "count": 1})
+        tokens = summary["tokens"].get("resume", {}).get("prompt", 0)
+        skills = resumes[0].skills if resumes else []
+        results[pdf.name] = (tokens / repeat, llm["seconds"] / llm["count"], skills)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=int, default=None, help="prompt token budget for compaction")
+    parser.add_argument("--repeat", type=int, default=3, help="calls per resume and mode")
+    parser.add_argument("--token-latency", type=float, default=0.0005,
+                        help="fake seconds per prompt token when running offline")
+    args = parser.parse_args()
+
+    pdfs = sorted((ROOT / "test_data").glob("*.pdf"))
+    if os.getenv("GROQ_API_KEY"):
+        client = get_client()
+        print("Using the live Groq API")
+    else:
+        client = FakeGroq(latency=0.2, token_latency=args.token_latency)
+        print(f"GROQ_API_KEY not set, using FakeGroq (0.2 s + {args.token_latency * 1000:.2f} ms/token)")
+
+    full = run(pdfs, client, False, None, args.repeat)
+    compact = run(pdfs, client, True, args.budget, args.repeat)
+
+    print(f"\n{'resume':<20} {'tokens':>15} {'latency (ms)':>17} {'skills kept':>12}")
+    totals = [0, 0, 0.0, 0.0]
+    for name, (tokens, latency, skills) in full.items():
+        c_tokens, c_latency, c_skills = compact[name]
+        kept = len(set(skills) & set(c_skills))
+        print(f"{name:<20} {tokens:>6.0f} -> {c_tokens:<6.0f} {latency * 1000:>7.0f} -> {c_latency * 1000:<7.0f}"
+              f" {kept:>5}/{len(skills)}")
+        totals = [totals[0] + tokens, totals[1] + c_tokens, totals[2] + latency, totals[3] + c_latency]
+
+    if totals[0]:
+        print(f"\nPrompt tokens: -{(1 - totals[1] / totals[0]) * 100:.1f}%, "
+              f"mean latency: -{(1 - totals[3] / max(totals[2], 1e-9)) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
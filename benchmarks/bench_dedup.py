@@ -0,0 +1,80 @@
+# bench_dedup.py
+# Cost and accuracy of the duplicate detector (dedup.py) on synthetic
+# resume texts built from one shared template, the hard case for MinHash
+# banding. A share of each batch is re-uploaded unchanged or with a few
+# words edited. Reports the time per resume as the batch grows (it should
+# stay flat), how many planted duplicates were found and how many distinct
+# resumes were wrongly grouped. An edit that changes a skill keeps a copy
+# apart, since near-duplicates must list the same skills.
+#
+#   python benchmarks/bench_dedup.py [--sizes 1000 10000 50000] [--duplicates 0.2]
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from dedup import DEFAULT_THRESHOLD, DuplicateDetector
+from skills import SKILL_VOCABULARY
+
+TEMPLATE = (
+    "curriculum vitae contact email phone linkedin profile summary experienced professional "
+    "work experience education bachelor of science references available on request"
+).split()
+WORDS = [w for skill in SKILL_VOCABULARY for w in skill.split()] + [
+    "led", "built", "designed", "team", "project", "company", "university", "years", "senior",
+    "developer", "engineer", "analyst", "improved", "delivered", "customers", "platform", "data",
+]
+
+
+def resume_text(rng, words=350):
+    body = [rng.choice(WORDS) for _ in range(words)]
+    return " ".join(TEMPLATE[:10] + body + TEMPLATE[10:])
+
+
+def edited(rng, text, edits):
+    words = text.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--duplicates", type=float, default=0.2, help="share of uploads that are copies")
+    parser.add_argument("--edits", type=int, default=5, help="words changed in an edited copy")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    print(f"{'resumes':>8} {'total (s)':>10} {'per resume (ms)':>16} {'found':>13} {'false groups':>13}")
+    for n in args.sizes:
+        rng = random.Random(n)
+        originals = int(n * (1 - args.duplicates))
+        texts = [(i, resume_text(rng)) for i in range(originals)]
+        for _ in range(n - originals):
+            source, text = texts[rng.randrange(originals)]
+            texts.append((source, text if rng.random() < 0.5 else edited(rng, text, args.edits)))
+        rng.shuffle(texts)
+
+        detector = DuplicateDetector(args.threshold)
+        found = wrong = 0
+        start = time.perf_counter()
+        for item in texts:
+            duplicate = detector.check(item, text=item[1])
+            if duplicate is not None:
+                if duplicate[0][0] == item[0]:
+                    found += 1
+                else:
+                    wrong += 1
+        seconds = time.perf_counter() - start
+
+        planted = n - originals
+        print(f"{n:>8,} {seconds:>10.2f} {seconds / n * 1000:>16.3f} {found:>6,}/{planted:<6,} {wrong:>13,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# bench_fuzzy.py
+# Exact against fuzzy skill matching on a synthetic pool whose skills are
+# spelled the way resumes spell them ("postgres", "tensorflow 2", ...).
+# Reports how many more JD skills fuzzy matching finds, the cold cost
+# (matrix build, n-gram vectors and similarity) and the re-rank cost once
+# the matches are cached.
+#
+#   python benchmarks/bench_fuzzy.py [--candidates 100000] [--threshold 0.75]
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import fuzzy
+from classes import Resume
+from scoring import ScoringEngine
+from skills import SKILL_VOCABULARY
+
+SUFFIXES = ["", "", "", " 2", " 3", "s", " framework", " development"]
+
+
+def spelled(rng, skill):
+    # A variant spelling of a canonical skill
+    word = skill + rng.choice(SUFFIXES)
+    if len(word) > 6 and rng.random() < 0.2:
+        word = word[:-1]
+    return word
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=100_000)
+    parser.add_argument("--skills", type=int, default=15, help="skills per candidate")
+    parser.add_argument("--jd-skills", type=int, default=12)
+    parser.add_argument("--threshold", type=float, default=fuzzy.DEFAULT_THRESHOLD)
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pool = [
+        Resume(f"candidate_{i}", [spelled(rng, s) for s in rng.sample(SKILL_VOCABULARY, args.skills)],
+               round(rng.uniform(0, 10), 1))
+        for i in range(args.candidates)
+    ]
+    required = rng.sample(SKILL_VOCABULARY, args.jd_skills)
+    print(f"{args.candidates:,} candidates x {args.skills} skills, {args.jd_skills} JD skills")
+
+    for mode in (False, True):
+        engine = ScoringEngine(fuzzy=mode, fuzzy_threshold=args.threshold)
+        _, cold = timed(lambda: engine.top_k(pool, required, 3, args.k))
+        _, warm = timed(lambda: engine.top_k(pool, required, 3, args.k))
+        engine.configure(skill_weight=0.5, experience_weight=0.5)
+        _, reweighted = timed(lambda: engine.top_k(pool, required, 3, args.k))
+        result, full = timed(lambda: engine.score(pool, required, 3))
+
+        matched = sum(len(m) for m in result.matched)
+        print(f"\n{'fuzzy' if mode else 'exact'}:")
+        print(f"  JD skills matched   {matched / len(pool):.2f} per candidate")
+        print(f"  top {args.k}, cold        {cold:8.1f} ms")
+        print(f"  top {args.k}, cached      {warm:8.1f} ms")
+        print(f"  top {args.k}, new weights {reweighted:8.1f} ms")
+        print(f"  full ranking        {full:8.1f} ms")
+        if mode:
+            sample = next(m for m in result.matched if any("≈" in s for s in m))
+            print(f"  e.g. {sample}")
+
+    print(f"\n{len(fuzzy.get_matcher()):,} unique skill names vectorized")
+
+
+if __name__ == "__main__":
+    main()
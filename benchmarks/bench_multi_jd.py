@@ -0,0 +1,65 @@
+# bench_multi_jd.py
+# One candidate pool against many job descriptions: ScoringEngine.score_jobs
+# (one candidate x job matrix product, per-job top k plus each candidate's
+# best 3 jobs) against one run per job - top_k when only the per-job
+# rankings are wanted, a full score() when every candidate's score for every
+# job is needed for best fits. Reports the timings and scored candidate-job
+# pairs per second as the pool and the number of jobs grow, and checks the
+# rankings agree.
+#
+#   python benchmarks/bench_multi_jd.py [--candidates 1000 10000 100000] [--jobs 1 10 30 100]
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from classes import Resume
+from scoring import ScoringEngine
+from skills import SKILL_VOCABULARY
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 10, 30, 100])
+    parser.add_argument("--skills", type=int, default=15, help="skills per candidate")
+    parser.add_argument("--jd-skills", type=int, default=12)
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'candidates':>10} {'jobs':>5} {'top_k x jobs':>13} {'score x jobs':>13} {'score_jobs':>11} "
+          f"{'speedup':>8} {'pairs/s':>12}   (ms)")
+    for n in args.candidates:
+        pool = [
+            Resume(f"candidate_{i}", rng.sample(SKILL_VOCABULARY, args.skills), round(rng.uniform(0, 10), 1))
+            for i in range(n)
+        ]
+        for m in args.jobs:
+            jobs = [(rng.sample(SKILL_VOCABULARY, args.jd_skills), rng.choice([0, 2, 3, 5])) for _ in range(m)]
+
+            engine = ScoringEngine()
+            # Built once up front; every path reuses the cached matrix
+            engine.matrix_for(pool)
+            looped, top_k_seconds = timed(lambda: [engine.top_k(pool, s, y, args.k).order for s, y in jobs])
+            _, score_seconds = timed(lambda: [engine.score(pool, s, y) for s, y in jobs])
+            result, grid_seconds = timed(lambda: engine.score_jobs(pool, jobs, k=args.k, best=3))
+
+            agree = all(a.tolist() == b.tolist() for a, b in zip(looped, result.rankings))
+            print(f"{n:>10,} {m:>5} {top_k_seconds * 1000:>13.1f} {score_seconds * 1000:>13.1f} "
+                  f"{grid_seconds * 1000:>11.1f} {score_seconds / grid_seconds:>7.1f}x "
+                  f"{n * m / grid_seconds:>12,.0f}{'' if agree else '  RANKINGS DIFFER'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# bench_normalization.py
+# Skill normalization throughput: the original replace/regex chain against
+# the one-pass rules, with and without the LRU memo, plus the time to
+# compile a large synonym dictionary.
+#
+#   python benchmarks/bench_normalization.py [--strings 2000000] [--distinct 5000]
+import re
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import skills
+from skills import CANONICAL_MAP, SKILL_VOCABULARY, SkillNormalizer, load_synonyms
+
+
+def legacy_normalize(skill):
+    # normalize_skill before the SkillNormalizer rewrite
+    skill = skill.lower().strip()
+    skill = skill.replace(".", "")
+    skill = skill.replace(",", "")
+    skill = skill.replace("-", " ")
+    skill = re.sub(r"\s+", " ", skill)
+    skill = skill.replace(" + +", "++")
+    skill = skill.replace(" #", "#")
+    return skill
+
+
+def legacy_canonical(skill):
+    skill = legacy_normalize(skill)
+    return CANONICAL_MAP.get(skill, skill)
+
+
+def variants(rng, count):
+    # Raw strings as a model or a resume might spell them
+    surfaces = SKILL_VOCABULARY + list(load_synonyms(skills.SYNONYMS_PATH))
+    out = set()
+    while len(out) < count:
+        word = rng.choice(surfaces)
+        word = "".join(c.upper() if rng.random() < 0.3 else c for c in word)
+        if rng.random() < 0.3:
+            word = word.replace(" ", rng.choice(["-", "  ", ".", " "]))
+        if rng.random() < 0.2:
+            word = f" {word} "
+        if rng.random() < 0.1:
+            word += rng.choice([".", ",", " js", "-js"])
+        out.add(word)
+    return sorted(out)
+
+
+def timed(label, func, strings):
+    start = time.perf_counter()
+    for s in strings:
+        func(s)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {len(strings) / elapsed / 1e6:6.2f} M strings/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--strings", type=int, default=2_000_000, help="skill strings to normalize")
+    parser.add_argument("--distinct", type=int, default=5000, help="distinct spellings among them")
+    parser.add_argument("--synonyms", type=int, default=50_000, help="size of the synthetic dictionary")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pool = variants(rng, args.distinct)
+    strings = [rng.choice(pool) for _ in range(args.strings)]
+
+    normalizer = skills.get_normalizer()
+    mismatched = sum(legacy_normalize(s) != normalizer.normalize(s) for s in pool)
+    print(f"{args.strings:,} strings, {len(pool):,} distinct; "
+          f"{mismatched} differ from the original normalize_skill")
+
+    uncached = SkillNormalizer(load_synonyms(skills.SYNONYMS_PATH), cache_size=0)
+    timed("original chain", legacy_canonical, strings)
+    timed("one pass, no memo", uncached.canonical, strings)
+    normalizer.canonical.cache_clear()
+    timed("one pass, LRU memo", skills.canonical_skill, strings)
+    print(f"  {normalizer.canonical.cache_info()}")
+
+    synthetic = {f"{word} {i}": f"skill {i % 1000}" for i, word in
+                 zip(range(args.synonyms), (rng.choice(SKILL_VOCABULARY) for _ in range(args.synonyms)))}
+    start = time.perf_counter()
+    SkillNormalizer(synthetic)
+    print(f"\nCompiled {len(synthetic):,} synonyms in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
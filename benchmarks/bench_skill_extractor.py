@@ -0,0 +1,69 @@
+# bench_skill_extractor.py
+# Compares the offline SkillExtractor against the Groq extraction path on the
+# test_data resumes. The LLM half only runs when GROQ_API_KEY is set.
+#
+#   python benchmarks/bench_skill_extractor.py [--repeat 2000]
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from classes import JobDescription, ResumeRankingSystem, extract_pdf_text
+from skills import SkillExtractor
+
+# The key may live in .env, which the app only reads when it builds a client
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=2000,
+                        help="passes over the sample texts for the local extractor")
+    args = parser.parse_args()
+
+    pdfs = sorted((ROOT / "test_data").glob("*.pdf"))
+    texts = [extract_pdf_text(p.read_bytes()) for p in pdfs]
+    total_chars = sum(len(t) for t in texts)
+
+    start = time.perf_counter()
+    extractor = SkillExtractor()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for text in texts:
+            extractor.extract(text)
+    elapsed = time.perf_counter() - start
+    scanned = args.repeat * len(texts)
+
+    print(f"Local extractor: built in {build_ms:.2f} ms")
+    print(f"  {scanned / elapsed:,.0f} resumes/s, "
+          f"{args.repeat * total_chars / elapsed / 1e6:.1f} MB/s of text")
+    for pdf, text in zip(pdfs, texts):
+        print(f"  {pdf.name}: {extractor.extract(text)}")
+
+    if not os.getenv("GROQ_API_KEY"):
+        print("\nGROQ_API_KEY not set, skipping LLM comparison.")
+        return
+
+    system = ResumeRankingSystem(concurrency=1)
+    system.job = JobDescription()
+    start = time.perf_counter()
+    resumes = system.process_resumes([str(p) for p in pdfs]) or []
+    elapsed = time.perf_counter() - start
+    print(f"\nLLM path: {len(resumes) / elapsed:.2f} resumes/s "
+          f"({elapsed / max(len(resumes), 1) * 1000:.0f} ms each)")
+    for resume in resumes:
+        local = set(extractor.extract(texts[[p.name for p in pdfs].index(resume.name)]))
+        overlap = len(local & set(resume.skills))
+        print(f"  {resume.name}: local found {overlap}/{len(resume.skills)} of the LLM skills")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# bench_startup.py
+# Cold-start and per-rerun overhead. Reports `python -X importtime` totals
+# for the app's modules, the slowest packages they pull in, the time for
+# CLI-Version/app.py to show its menu and exit, and (when streamlit is
+# installed) the first run and reruns of src/main.py's landing page.
+#
+#   python benchmarks/bench_startup.py [--repeat 5] [--reruns 20]
+import os
+import sys
+import time
+import logging
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from collections import defaultdict
+
+ROOT = Path(__file__).resolve().parent.parent
+MODULES = ["classes", "scoring", "candidate_index", "batch"]
+
+
+def child_env():
+    env = dict(os.environ)
+    paths = [str(ROOT / "src"), str(ROOT / "CLI-Version"), env.get("PYTHONPATH", "")]
+    env["PYTHONPATH"] = os.pathsep.join(p for p in paths if p)
+    return env
+
+
+def import_profile(module):
+    # (total microseconds, {top-level package: self microseconds})
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=child_env(), cwd=ROOT
+    )
+    if result.returncode != 0:
+        return None, {}
+
+    total, packages = 0, defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        packages[name.split(".")[0]] += int(self_us)
+        if name == module:
+            total = int(cumulative)
+    return total, packages
+
+
+def cli_menu_seconds(repeat):
+    # Start app.py, print the menu, choose "Exit"
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, str(ROOT / "CLI-Version" / "app.py")], input="7\n",
+            capture_output=True, text=True, env=child_env(), cwd=ROOT
+        )
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def streamlit_runs(reruns):
+    # (first run, median rerun) seconds for the landing page
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return None
+    # Deprecation notices would be logged on every run
+    logging.disable(logging.WARNING)
+    sys.path.insert(0, str(ROOT / "src"))
+    app = AppTest.from_file(str(ROOT / "src" / "main.py"), default_timeout=120)
+    start = time.perf_counter()
+    app.run()
+    first = time.perf_counter() - start
+
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        times.append(time.perf_counter() - start)
+    return first, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5, help="cold starts per measurement")
+    parser.add_argument("--reruns", type=int, default=20, help="Streamlit reruns to time")
+    parser.add_argument("--top", type=int, default=8, help="slowest packages to list")
+    args = parser.parse_args()
+
+    print(f"{'module':<18} {'import (ms)':>12}")
+    slowest = defaultdict(int)
+    for module in MODULES:
+        runs = [import_profile(module) for _ in range(args.repeat)]
+        totals = [total for total, _ in runs if total is not None]
+        if not totals:
+            print(f"{module:<18} {'failed':>12}")
+            continue
+        print(f"{module:<18} {statistics.median(totals) / 1000:>12.1f}")
+        for package, micros in runs[-1][1].items():
+            slowest[package] = max(slowest[package], micros)
+
+    print("\nSlowest packages (self time, ms):")
+    for package, micros in sorted(slowest.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {package:<24} {micros / 1000:8.1f}")
+
+    print(f"\nCLI menu start + exit:   {cli_menu_seconds(args.repeat) * 1000:8.1f} ms")
+
+    runs = streamlit_runs(args.reruns)
+    if runs is None:
+        print("streamlit not installed, skipping the app")
+    else:
+        print(f"Streamlit first run:     {runs[0] * 1000:8.1f} ms")
+        print(f"Streamlit rerun:         {runs[1] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# bench_tail_latency.py
+# Tail latency of resume extraction calls with and without the timeout,
+# retry and hedging policy, against FakeGroq with injected slow responses.
+#
+#   python benchmarks/bench_tail_latency.py [--resumes 300] [--slow-rate 0.05]
+import io
+import sys
+import time
+import argparse
+import contextlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from classes import JobDescription, ResumeError, ResumeRankingSystem
+from fake_groq import FakeGroq
+from bench_pipeline import synthetic_pdfs
+
+POLICIES = {
+    "baseline": {},
+    "timeout + retries": {"request_timeout": 1.0, "max_retries": 2},
+    "hedged (p90)": {"request_timeout": 1.0, "max_retries": 2, "hedge_percentile": 90},
+}
+
+
+def run(pdfs, client, concurrency, policy, deadline):
+    system = ResumeRankingSystem(
+        concurrency=concurrency, parse_workers=0, batch_deadline=deadline, client=client, dedup=False, **policy
+    )
+    system.job = JobDescription(metrics=system.metrics, client=client)
+    system.job.skills, system.job.required_experience = ["python"], 2.0
+
+    failed = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for item in system.iter_process_resumes(pdfs):
+            failed += isinstance(item, ResumeError)
+    elapsed = time.perf_counter() - start
+
+    summary = system.metrics.summary()
+    return elapsed, failed, summary["stages"].get("llm", {}), summary["counters"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--slow-rate", type=float, default=0.05, help="fraction of calls that stall")
+    parser.add_argument("--slow-latency", type=float, default=5.0, help="seconds a stalled call takes")
+    parser.add_argument("--deadline", type=float, default=None, help="per-batch deadline in seconds")
+    args = parser.parse_args()
+
+    pdfs = synthetic_pdfs(args.resumes)
+    print(f"{args.resumes} resumes, concurrency {args.concurrency}, "
+          f"{args.slow_rate:.0%} of calls stall for {args.slow_latency:.1f}s\n")
+    print(f"{'policy':<20} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} {'batch':>7} {'failed':>6}  events")
+    for name, policy in POLICIES.items():
+        client = FakeGroq(args.latency, args.jitter, seed=1, slow_rate=args.slow_rate, slow_latency=args.slow_latency)
+        elapsed, failed, llm, counters = run(pdfs, client, args.concurrency, policy, args.deadline)
+        events = {k: v for k, v in counters.items()
+                  if k.startswith("llm_") and k != "llm_requests" or k == "deadline_exceeded"}
+        print(f"{name:<20} {llm.get('p50', 0):>6.2f}s {llm.get('p95', 0):>6.2f}s {llm.get('p99', 0):>6.2f}s "
+              f"{llm.get('max', 0):>6.2f}s {elapsed:>6.1f}s {failed:>6}  {events}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# fake_groq.py
+# Local stand-in for the Groq client used by the benchmarks. It answers the
+# JD, single-resume and batched prompts with well-formed JSON built by the
+# offline SkillExtractor, after a configurable delay, and fails a chosen
+# fraction of calls. Pass it as the client of a ResumeRankingSystem (and
+# JobDescription), or install it for the whole process with llm.set_client:
+#
+#   system = ResumeRankingSystem(client=FakeGroq(latency=0.3, jitter=0.1, error_rate=0.01))
+#   llm.set_client(FakeGroq())
+import re
+import sys
+import json
+import time
+import random
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from skills import SkillExtractor, estimate_experience
+
+_RESUME_ID = re.compile(r'RESUME ID: (\S+)\n"""(.*?)"""', re.DOTALL)
+_QUOTED = re.compile(r'"""(.*?)"""', re.DOTALL)
+
+
+class FakeGroqError(RuntimeError):
+    # Plays a 503 answer, which LLMCaller retries
+    status_code = 503
+
+
+class _Message:
+    def __init__(self, content):
+        self.content = content
+
+
+class _Choice:
+    def __init__(self, content):
+        self.message = _Message(content)
+
+
+class _Usage:
+    def __init__(self, prompt_tokens, completion_tokens):
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.total_tokens = prompt_tokens + completion_tokens
+
+
+class _Response:
+    def __init__(self, content, prompt_tokens):
+        self.choices = [_Choice(content)]
+        self.usage = _Usage(prompt_tokens, len(content) // 4 + 1)
+
+
+class _Completions:
+    def __init__(self, client):
+        self._client = client
+
+    def create(self, model=None, messages=(), timeout=None, **kwargs):
+        return self._client._complete(messages, timeout)
+
+
+class _Chat:
+    def __init__(self, client):
+        self.completions = _Completions(client)
+
+
+class FakeGroq:
+    # latency/jitter are seconds (delay = latency +/- uniform jitter, plus
+    # token_latency per prompt token); error_rate is the fraction of calls
+    # that raise FakeGroqError and slow_rate the fraction that take
+    # slow_latency instead. A `timeout` passed to create() is honoured the
+    # way the real SDK does, by raising once it has elapsed.
+    # Every call's duration is kept in `latencies` for percentile reports.
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, seed=0, token_latency=0.0,
+                 slow_rate=0.0, slow_latency=5.0):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.chat = _Chat(self)
+        self.extractor = SkillExtractor()
+        self.latencies = []
+        self.calls = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.latencies = []
+            self.calls = 0
+            self.errors = 0
+
+    def _complete(self, messages, timeout=None):
+        start = time.perf_counter()
+        prompt = messages[-1]["content"] if messages else ""
+        prompt_tokens = len(prompt) // 4 + 1
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            delay += prompt_tokens * self.token_latency
+            if self._random.random() < self.slow_rate:
+                delay = self.slow_latency
+            failed = self._random.random() < self.error_rate
+        timed_out = timeout is not None and delay > timeout
+        time.sleep(timeout if timed_out else delay)
+
+        try:
+            if timed_out:
+                raise TimeoutError("simulated request timeout")
+            if failed:
+                raise FakeGroqError("simulated API error")
+            return _Response(self._answer(prompt), prompt_tokens)
+        finally:
+            with self._lock:
+                self.errors += failed
+                self.latencies.append(time.perf_counter() - start)
+
+    def _answer(self, prompt):
+        if "RESUME ID:" in prompt:
+            return json.dumps([
+                {"id": task_id, **self._extract(text)}
+                for task_id, text in _RESUME_ID.findall(prompt)
+            ])
+        match = _QUOTED.search(prompt)
+        return json.dumps(self._extract(match.group(1) if match else prompt))
+
+    def _extract(self, text):
+        return {
+            "skills": self.extractor.extract(text),
+            "experience_years": estimate_experience(text),
+        }
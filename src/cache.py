@@ -0,0 +1,115 @@
+# cache.py
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "extractions.sqlite3")
+# Job description results live in their own file with a shorter lifetime
+DEFAULT_JD_CACHE_PATH = os.path.join(".cache", "jd_extractions.sqlite3")
+
+
+class ExtractionCache:
+    # Persistent, content-addressed store of extraction results, as
+    # (skills, experience) pairs. Entries are keyed by a hash of the input
+    # (PDF bytes or JD text), the prompt template and the model name, so
+    # changing either of the latter invalidates old rows.
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=10000, max_age_days=30):
+        # max_age_days may be fractional, e.g. 1 / 24 for a one hour TTL
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 86400 if max_age_days else None
+        self.hits = 0
+        self.misses = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # One shared connection guarded by a lock; workers call in from threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS extractions (
+                key TEXT PRIMARY KEY,
+                skills TEXT NOT NULL,
+                experience REAL NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_extractions_last_used ON extractions (last_used)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(data: bytes, prompt: str, model: str):
+        digest = hashlib.sha256()
+        digest.update(hashlib.sha256(data).digest())
+        digest.update(hashlib.sha256(prompt.encode("utf-8")).digest())
+        digest.update(model.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT skills, experience, created_at FROM extractions WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None or self._expired(row[2], now):
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE extractions SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(row[0]), row[1]
+
+    def put(self, key, skills, experience):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, skills, experience, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(skills), float(experience), now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": size}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM extractions")
+            self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _expired(self, created_at, now):
+        return self.max_age_seconds is not None and now - created_at > self.max_age_seconds
+
+    def _evict(self, now):
+        # Age first, then trim the least recently used rows down to max_entries
+        if self.max_age_seconds is not None:
+            self._conn.execute(
+                "DELETE FROM extractions WHERE created_at < ?",
+                (now - self.max_age_seconds,)
+            )
+        if self.max_entries:
+            self._conn.execute(
+                "DELETE FROM extractions WHERE key IN ("
+                "SELECT key FROM extractions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
@@ -0,0 +1,205 @@
+# candidate_index.py
+import os
+import json
+import sqlite3
+import threading
+import numpy as np
+
+from classes import Resume
+from skills import canonicalize_skill
+from scoring import EXPERIENCE_CAP, EXPERIENCE_WEIGHT, SKILL_WEIGHT, prune_for_top_k, rank_order, round1
+
+DEFAULT_INDEX_PATH = os.path.join(".cache", "candidates.sqlite3")
+
+
+class CandidateIndex:
+    # Persistent candidate pool with an inverted index from canonical skill
+    # to candidate IDs. SQLite stores the candidates; on open the posting
+    # lists are built in memory from their skills (re-canonicalized, so a
+    # changed synonym dictionary applies) and a new job description is
+    # ranked from posting lists alone, with no LLM calls for resumes.
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS candidates (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content_key TEXT UNIQUE,
+                name TEXT NOT NULL,
+                skills TEXT NOT NULL,
+                experience REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+        self.names = {}
+        self.skills = {}
+        self._postings = {}
+        self._posting_arrays = {}
+        self._experience = np.zeros(0, dtype=np.float64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._load()
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, candidate_id):
+        return candidate_id in self.names
+
+    def _load(self):
+        rows = self._conn.execute("SELECT id, name, skills, experience FROM candidates").fetchall()
+        for candidate_id, name, skills, experience in rows:
+            # Re-mapped in case the synonym dictionary changed since storing
+            skills = list(dict.fromkeys(canonicalize_skill(s) for s in json.loads(skills)))
+            self._remember(candidate_id, name, skills, experience)
+
+    def _remember(self, candidate_id, name, skills, experience):
+        if candidate_id >= len(self._alive):
+            size = max(candidate_id + 1, len(self._alive) * 2, 1024)
+            self._experience = np.resize(self._experience, size)
+            self._alive = np.concatenate([self._alive, np.zeros(size - len(self._alive), dtype=bool)])
+
+        self.names[candidate_id] = name
+        self.skills[candidate_id] = skills
+        self._experience[candidate_id] = float(experience)
+        self._alive[candidate_id] = True
+        for skill in skills:
+            self._postings.setdefault(skill, []).append(candidate_id)
+            self._posting_arrays.pop(skill, None)
+
+    def add(self, name, skills, experience, content_key=None):
+        return self.add_many([(name, skills, experience, content_key)])[0]
+
+    def add_resumes(self, resumes, content_keys=None):
+        content_keys = content_keys or [None] * len(resumes)
+        return self.add_many(
+            (r.name, r.skills, r.experience, key) for r, key in zip(resumes, content_keys)
+        )
+
+    def add_many(self, entries):
+        # entries: iterable of (name, skills, experience, content_key). A
+        # content_key that is already stored returns the existing ID instead
+        # of adding the same resume twice.
+        ids = []
+        with self._lock:
+            for name, skills, experience, content_key in entries:
+                if content_key is not None:
+                    row = self._conn.execute(
+                        "SELECT id FROM candidates WHERE content_key = ?", (content_key,)
+                    ).fetchone()
+                    if row is not None:
+                        ids.append(row[0])
+                        continue
+
+                skills = list(dict.fromkeys(skills))
+                cursor = self._conn.execute(
+                    "INSERT INTO candidates (content_key, name, skills, experience) VALUES (?, ?, ?, ?)",
+                    (content_key, name, json.dumps(skills), float(experience))
+                )
+                candidate_id = cursor.lastrowid
+                self._remember(candidate_id, name, skills, experience)
+                ids.append(candidate_id)
+            self._conn.commit()
+        return ids
+
+    def remove(self, candidate_id):
+        with self._lock:
+            if candidate_id not in self.names:
+                return False
+
+            self._conn.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,))
+            self._conn.commit()
+
+            # Posting lists keep the stale ID; the alive mask filters it out
+            self._alive[candidate_id] = False
+            del self.names[candidate_id]
+            del self.skills[candidate_id]
+        return True
+
+    def _posting(self, skill):
+        array = self._posting_arrays.get(skill)
+        if array is None:
+            array = np.array(self._postings.get(skill, ()), dtype=np.int64)
+            self._posting_arrays[skill] = array
+        return array
+
+    def matching(self, skills, require_all=False):
+        # Candidate IDs having all (intersection) or any (union) of the skills
+        with self._lock:
+            skills = list(dict.fromkeys(skills))
+            if not skills:
+                return []
+            postings = [self._posting(skill) for skill in skills]
+            if require_all:
+                ids = postings[0]
+                for posting in postings[1:]:
+                    ids = np.intersect1d(ids, posting, assume_unique=True)
+            else:
+                ids = np.unique(np.concatenate(postings))
+            return ids[self._alive[ids]].tolist()
+
+    def query(self, required_skills, required_experience=0.0, k=20, must_have=(),
+              skill_weight=SKILL_WEIGHT, experience_weight=EXPERIENCE_WEIGHT, experience_cap=EXPERIENCE_CAP):
+        # Top-k candidates for a job description, scored exactly like
+        # ResumeRankingSystem.calculate_scores. Match counts come from the
+        # union of the JD skills' posting lists; must_have skills restrict
+        # the pool to the intersection of their posting lists.
+        required = list(dict.fromkeys(required_skills))
+        with self._lock:
+            size = len(self._alive)
+            counts = np.zeros(size, dtype=np.int64)
+            for skill in required:
+                counts[self._posting(skill)] += 1
+
+            pool = self._alive.copy()
+            for skill in dict.fromkeys(must_have):
+                in_posting = np.zeros(size, dtype=bool)
+                in_posting[self._posting(skill)] = True
+                pool &= in_posting
+
+            ids = np.flatnonzero(pool)
+            counts = counts[ids]
+            experience = self._experience[ids]
+
+            if required:
+                skill_raw = counts / len(required) * 100
+            else:
+                skill_raw = np.zeros(len(ids))
+            if required_experience > 0:
+                exp_raw = np.minimum(experience / required_experience * 100, experience_cap)
+            else:
+                exp_raw = np.zeros(len(ids))
+            final_raw = skill_raw * skill_weight + exp_raw * experience_weight
+
+            # Only candidates that can still reach the top k are rounded and sorted
+            keep = prune_for_top_k(final_raw, k)
+            ids = ids[keep]
+            skill_pct, exp_pct, score = round1(skill_raw[keep]), round1(exp_raw[keep]), round1(final_raw[keep])
+            top = rank_order(score, skill_pct, exp_pct, k=k, tiebreak=ids)
+
+            results = []
+            for i in top.tolist():
+                candidate_id = int(ids[i])
+                resume = Resume(
+                    name=self.names[candidate_id],
+                    skills=list(self.skills[candidate_id]),
+                    experience=float(self._experience[candidate_id])
+                )
+                resume.candidate_id = candidate_id
+                resume.skill_match_pct = float(skill_pct[i])
+                resume.exp_score_pct = float(exp_pct[i])
+                resume.score = float(score[i])
+                have = set(resume.skills)
+                resume.matched_skills = [s for s in required if s in have]
+                resume.missing_skills = [s for s in required if s not in have]
+                results.append(resume)
+        return results
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
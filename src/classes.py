@@ -4,66 +4,32 @@
 # classes.py
 import os
 import re
-from groq import Groq
-from dotenv import load_dotenv
+import bisect
+import hashlib
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+)
 import json
-import fitz
-# load variables from .env file
-load_dotenv()
+from llm import DeadlineExceeded, LLMCaller, get_client
+from metrics import Metrics
+from sections import compact_resume, estimate_tokens
+from skills import (
+    SkillExtractor, canonical_skill, canonicalize_skill, estimate_experience
+)
+MODEL_NAME = "qwen/qwen3-32b"
 
-CANONICAL_MAP = {
-    "ml": "machine learning",
-    "ai": "artificial intelligence",
-    "react js": "react",
-    "reactjs": "react",
-    "node js": "nodejs",
-    "js": "javascript",
-    "py": "python"
-}
+# How resume skills are extracted:
+#   "llm"      - Groq call per resume (default)
+#   "local"    - offline SkillExtractor only, no network
+#   "prefill"  - local matches are taken as-is and removed from the prompt text
+#   "fallback" - Groq call, but use the local result if the call fails
+EXTRACTION_MODES = ("llm", "local", "prefill", "fallback")
 
-def normalize_skill(skill):
-    skill = skill.lower().strip()
-
-    # Remove dots (node.js → nodejs)
-    skill = skill.replace(".", "")
-
-    # Remove commas
-    skill = skill.replace(",", "")
-
-    # Remove hyphens (react-js → react js)
-    skill = skill.replace("-", " ")
-
-    # Collapse multiple spaces
-    skill = re.sub(r"\s+", " ", skill)
-
-    # Fix common spacing issues around symbols
-    skill = skill.replace(" + +", "++")
-    skill = skill.replace(" #", "#")
-
-    return skill
-
-def canonicalize_skill(skill):
-    if skill in CANONICAL_MAP:
-        return CANONICAL_MAP[skill]
-    return skill
-
-class JobDescription:
-    def __init__(self):
-        self.skills = []
-        self.required_experience = 0.0
-        self.raw_text = ""
-        self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-
-    # Backend-only function: just process whatever text is passed
-    def process_text(self, raw_text: str):
-        self.raw_text = raw_text.strip()
-        if not self.raw_text:
-            print("❌ No Job Description text provided.")
-            self.skills = []
-            self.required_experience = 0.0
-            return
-
-        prompt = f"""
+JD_PROMPT = """
         You are a strict data extraction engine.
         
         Extract ONLY:
@@ -85,22 +51,147 @@ class JobDescription:
         If no skills found, return an empty list.
         
         Job Description:
-        \"\"\"{self.raw_text}\"\"\"
+        \"\"\"{text}\"\"\"
         """
 
+RESUME_PROMPT = """
+                Extract ONLY:
+                1. All technical skills (from Skills section and project tools mentioned in the resume).
+                2. Total professional experience in years (decimal allowed, e.g., 2.5 for 2 years 6 months).
+                
+                Return ONLY valid JSON in this exact format:
+                {{
+                    "skills": ["skill1", "skill2"],
+                    "experience_years": 0.0
+                }}
+                
+                NO explanations, NO markdown, NO extra text, NO thoughts.
+                
+                Resume text:
+            \"\"\"{text}\"\"\"
+            """
+
+RESUME_BATCH_PROMPT = """
+                Each resume below starts with a line "RESUME ID: <id>".
+                For EVERY resume extract ONLY:
+                1. All technical skills (from Skills section and project tools mentioned in the resume).
+                2. Total professional experience in years (decimal allowed, e.g., 2.5 for 2 years 6 months).
+                
+                Return ONLY a valid JSON array with one object per resume, in this exact format:
+                [
+                    {{"id": "<id>", "skills": ["skill1", "skill2"], "experience_years": 0.0}}
+                ]
+                
+                NO explanations, NO markdown, NO extra text, NO thoughts.
+                
+                Resumes:
+            {resumes}
+            """
+
+class RateLimiter:
+    # Spaces request start times evenly so at most `requests_per_minute`
+    # calls begin in any 60 second window, across all worker threads.
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self, deadline=None):
+        # deadline is a time.monotonic() value. A call whose slot would come
+        # at or after it raises DeadlineExceeded at once and reserves
+        # nothing, so expired tasks do not hold up the ones behind them.
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            if deadline is not None and slot >= deadline:
+                raise DeadlineExceeded("Batch deadline passed before a request slot was free")
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def try_acquire(self):
+        # Takes a slot only if one is free right now, without waiting
+        with self._lock:
+            now = time.monotonic()
+            if self._next_slot > now:
+                return False
+            self._next_slot = now + self.interval
+            return True
+
+class JobDescription:
+    def __init__(self, metrics=None, cache=None, caller=None, client=None):
+        self.skills = []
+        self.required_experience = 0.0
+        self.raw_text = ""
+        # The process-wide pooled client unless one is passed (llm.py),
+        # looked up on the first call so offline use never builds one
+        self.client = client
+        # Pass ResumeRankingSystem.metrics to count JD calls with the rest
+        self.metrics = metrics if metrics is not None else Metrics()
+        # Optional ExtractionCache keyed by whitespace-normalized JD text
+        self.cache = cache
+        # Timeout/retry/hedging policy; pass ResumeRankingSystem.llm to share it
+        self.caller = caller if caller is not None else LLMCaller()
+
+    def process_text_local(self, raw_text: str, extractor=None):
+        # Offline counterpart of process_text for extraction_mode="local":
+        # the same SkillExtractor and experience estimate as the resumes,
+        # no LLM call
+        self.raw_text = raw_text.strip()
+        extractor = extractor or SkillExtractor()
+        with self.metrics.timer("jd_local"):
+            self.skills = extractor.extract(self.raw_text)
+            self.required_experience = estimate_experience(self.raw_text)
+        print("✅ Job Description processed locally!")
+        print("Extracted skills:", self.skills)
+        print("Required experience (years):", self.required_experience)
+
+    # Backend-only function: just process whatever text is passed
+    def process_text(self, raw_text: str):
+        self.raw_text = raw_text.strip()
+        if not self.raw_text:
+            print("❌ No Job Description text provided.")
+            self.skills = []
+            self.required_experience = 0.0
+            return
+
+        # Resubmitting the same posting (after Edit, Reset or from another
+        # session) is answered from the cache with no network round-trip
+        cache_key = None
+        if self.cache is not None:
+            normalized = " ".join(self.raw_text.split())
+            cache_key = self.cache.make_key(normalized.encode("utf-8"), JD_PROMPT, MODEL_NAME)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.metrics.incr("jd_cache_hits")
+                skills, self.required_experience = cached
+                self.skills = list(dict.fromkeys(canonicalize_skill(s) for s in skills))
+                print("✅ Job Description loaded from cache!")
+                print("Extracted skills:", self.skills)
+                print("Required experience (years):", self.required_experience)
+                return
+
+        prompt = JD_PROMPT.format(text=self.raw_text)
+
         try:
-            response = self.client.chat.completions.create(
-                model="qwen/qwen3-32b",
-                temperature=0,
-                messages=[
-                    {"role": "system", "content": "You extract structured job requirement information."},
-                    {"role": "user", "content": prompt}
-                ],
-                reasoning_effort="none"
-            )
+            self.metrics.incr("jd_requests")
+            with self.metrics.timer("jd_llm"):
+                response = self.caller.call(
+                    self.client if self.client is not None else get_client(),
+                    metrics=self.metrics,
+                    model=MODEL_NAME,
+                    temperature=0,
+                    messages=[
+                        {"role": "system", "content": "You extract structured job requirement information."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    reasoning_effort="none"
+                )
+            self.metrics.add_tokens("jd", getattr(response, "usage", None))
 
             output_text = response.choices[0].message.content.strip()
-            result = json.loads(output_text)
+            with self.metrics.timer("jd_json"):
+                result = json.loads(output_text)
 
             skills = result.get("skills", [])
             experience = result.get("experience_years", 0)
@@ -111,14 +202,17 @@ class JobDescription:
             if not isinstance(experience, (int, float)):
                 experience = 0
 
-            self.skills = [canonicalize_skill(normalize_skill(s)) for s in skills]
+            self.skills = list(dict.fromkeys(canonical_skill(s) for s in skills))
             self.required_experience = round(float(experience), 1)
+            if cache_key is not None:
+                self.cache.put(cache_key, self.skills, self.required_experience)
 
             print("✅ Job Description processed successfully!")
             print("Extracted skills:", self.skills)
             print("Required experience (years):", self.required_experience)
 
         except Exception as e:
+            self.metrics.incr("jd_errors")
             print("❌ Error processing Job Description:", str(e))
             self.skills = []
             self.required_experience = 0
@@ -135,90 +229,871 @@ class Resume:
         # NEW: transparency fields
         self.matched_skills = []
         self.missing_skills = []
+        # Must-have skills (see ResumeRankingSystem.configure_scoring) it lacks
+        self.missing_must_have = []
+        # Set when the resume comes from (or is stored in) a CandidateIndex
+        self.candidate_id = None
+        # Same resume uploaded more than once (see dedup.py): copies point to
+        # the name of the one that is ranked, which lists their names
+        self.duplicate_of = None
+        self.duplicates = []
+
+class JobMatch:
+    # A candidate's scores against one of several job descriptions (see
+    # ResumeRankingSystem.rank_jobs). The Resume is shared by every job, so
+    # per-job scores live here instead of on the Resume.
+    def __init__(self, resume, job_index, job, score, skill_match_pct, exp_score_pct,
+                 matched_skills, missing_skills, missing_must_have):
+        self.resume = resume
+        self.job_index = job_index
+        self.job = job
+        self.score = score
+        self.skill_match_pct = skill_match_pct
+        self.exp_score_pct = exp_score_pct
+        self.matched_skills = matched_skills
+        self.missing_skills = missing_skills
+        self.missing_must_have = missing_must_have
+
+    def __repr__(self):
+        return f"JobMatch({self.resume.name!r}, job={self.job_index}, score={self.score})"
+
+class ResumeTask:
+    # One resume moving through extraction: raw bytes -> cleaned text -> result
+    def __init__(self, task_id, name, source, index=0):
+        self.task_id = task_id
+        self.index = index
+        self.name = name
+        self.source = source
+        self.cache_key = None
+        self.content_hash = None
+        self.text = None
+        self.prefill_skills = []
+        # time.monotonic() by which the task must be finished, if any
+        self.deadline = None
+        # Row of this resume in the current JobStore job, if any
+        self.job_position = None
+        # Duplicate detection: the task this one copies its result from, the
+        # tasks copying from this one, and whether its result is final
+        self.duplicate_of = None
+        self.duplicates = []
+        self.released = False
+        self.resume = None
+        self.skills = None
+        self.experience = None
+        self.error = None
+
+    @property
+    def done(self):
+        return self.skills is not None or self.error is not None
+
+    def to_resume(self):
+        return Resume(name=self.name, skills=self.skills, experience=self.experience)
+
+class ResumeError:
+    # Yielded by iter_process_resumes for an input that could not be processed
+    def __init__(self, index, name, exception):
+        self.index = index
+        self.name = name
+        self.exception = exception
+        self.message = str(exception)
+
+    def __repr__(self):
+        return f"ResumeError({self.name!r}, {self.message!r})"
+
+def strip_thinking(output_text):
+    return re.sub(r"<think>.*?</think>", "", output_text, flags=re.DOTALL).strip()
+
+def parse_resume_result(result):
+    skills = result.get("skills", [])
+    if not isinstance(skills, list):
+        raise ValueError("AI output has no skills list.")
+
+    skills = list(dict.fromkeys(canonical_skill(s) for s in skills if isinstance(s, str)))
+    experience = result.get("experience_years", 0)
+    try:
+        experience = round(float(experience), 1)
+    except:
+        experience = 0.0
+    return skills, experience
+
+def parse_batch_output(output_text, task_ids):
+    # Returns {task_id: (skills, experience)} for every well-formed entry;
+    # anything missing or malformed is simply left out so it can be retried.
+    output_text = strip_thinking(output_text)
+    start, end = output_text.find("["), output_text.rfind("]")
+    if start == -1 or end < start:
+        return {}
+
+    try:
+        entries = json.loads(output_text[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+
+    parsed = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or str(entry.get("id")) not in task_ids:
+            continue
+        try:
+            parsed[str(entry["id"])] = parse_resume_result(entry)
+        except ValueError:
+            continue
+    return parsed
+
+def resolve_source(item, index=0):
+    # Accepts a file path, raw PDF bytes, a (name, bytes) pair or a
+    # file-like object such as a Streamlit UploadedFile, and returns
+    # (display name, path or bytes) without touching the disk.
+    if isinstance(item, tuple) and len(item) == 2:
+        name, data = item
+        return name, resolve_source(data, index)[1]
+
+    if isinstance(item, (str, os.PathLike)):
+        path = os.fspath(item)
+        return os.path.basename(path), path
+
+    if isinstance(item, (bytes, bytearray, memoryview)):
+        return f"resume_{index + 1}.pdf", bytes(item)
+
+    if hasattr(item, "getvalue"):
+        data = item.getvalue()
+    elif hasattr(item, "read"):
+        data = item.read()
+    else:
+        raise TypeError(f"Unsupported resume input: {type(item).__name__}")
+
+    name = os.path.basename(getattr(item, "name", "") or f"resume_{index + 1}.pdf")
+    return name, bytes(data)
+
+def extract_pdf_text(data, max_pages=None, max_chars=None, keep_lines=False):
+    return extract_pdf_text_timed(data, max_pages, max_chars, keep_lines)[0]
+
+def extract_pdf_text_timed(data, max_pages=None, max_chars=None, keep_lines=False):
+    # Runs in a parse worker process: PDF bytes -> whitespace-collapsed text,
+    # plus seconds spent in fitz and in cleaning for the parent's metrics.
+    # Pages are cleaned one at a time and joined once at the end. With
+    # keep_lines, line breaks survive so section headings can be found.
+    parts, size = [], 0
+    timings = {"pdf_extract": 0.0, "text_clean": 0.0}
+    # Imported here: PyMuPDF is slow to load and only parsing needs it
+    import fitz
+    start = time.perf_counter()
+    doc = fitz.open(stream=data, filetype="pdf")
+    timings["pdf_extract"] += time.perf_counter() - start
+    try:
+        for page_number, page in enumerate(doc):
+            if max_pages and page_number >= max_pages:
+                break
+            start = time.perf_counter()
+            raw = page.get_text()
+            middle = time.perf_counter()
+            if keep_lines:
+                chunk = "\n".join(" ".join(line.split()) for line in raw.splitlines() if line.strip())
+            else:
+                chunk = " ".join(raw.split())
+            timings["pdf_extract"] += middle - start
+            timings["text_clean"] += time.perf_counter() - middle
+            if not chunk:
+                continue
+            parts.append(chunk)
+            size += len(chunk) + 1
+            if max_chars and size >= max_chars:
+                break
+    finally:
+        doc.close()
+
+    text = ("\n" if keep_lines else " ").join(parts)
+    return (text[:max_chars] if max_chars else text), timings
 
 class ResumeRankingSystem:
-    def __init__(self):
+    def __init__(self, concurrency=1, requests_per_minute=None, cache=None, batch_token_budget=None,
+                 parse_workers=None, max_pages=None, max_chars=None, queue_size=None,
+                 extraction_mode="llm", skill_extractor=None, candidate_index=None,
+                 metrics_log=None, metrics_file=None, compact_prompts=False, prompt_token_budget=None,
+                 request_timeout=None, max_retries=0, hedge_after=None, hedge_percentile=None,
+                 batch_deadline=None, client=None, job_store=None, dedup=True, dedup_threshold=None):
+        if extraction_mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {extraction_mode}")
+
         self.job = None
+        # Several processed JobDescriptions to rank one pool against (see
+        # rank_jobs); resumes are extracted once whichever are set
+        self.jobs = []
         self.resumes = []
-    def process_resumes(self, paths: list):
-        if self.job is None:
-            print("❌ Please insert a Job Description first!")
+        # Optional ExtractionCache shared across runs (see cache.py)
+        self.cache = cache
+        # Number of resumes extracted in parallel and optional API rate cap
+        self.concurrency = concurrency
+        self.requests_per_minute = requests_per_minute
+        # When set, several resumes are packed into one request up to this many tokens
+        self.batch_token_budget = batch_token_budget
+        # PDF parsing: worker processes (0 = parse in a thread), page/char caps
+        # and how many parsed resumes may wait for the LLM stage at once
+        self.parse_workers = parse_workers
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.queue_size = queue_size
+        self.extraction_mode = extraction_mode
+        # Send the model only the skills/experience/summary/projects sections,
+        # optionally capped at prompt_token_budget estimated tokens (sections.py)
+        self.compact_prompts = compact_prompts
+        self.prompt_token_budget = prompt_token_budget
+        self.skill_extractor = skill_extractor or SkillExtractor()
+        # Interned skill matrix, reused while the candidate pool is unchanged;
+        # built on first use (see scoring_engine). Scoring may be asked for
+        # from other threads (e.g. a deferred Streamlit download), so it runs
+        # under a lock.
+        self._scoring_engine = None
+        self._scoring_lock = threading.Lock()
+        # Optional CandidateIndex; processed resumes are added to it
+        self.candidate_index = candidate_index
+        # Stage timings, token usage and retry counts: running totals plus the
+        # latest batch. After each batch they are optionally appended to a
+        # JSON log and written as a Prometheus text file.
+        self.metrics = Metrics()
+        self.batch_metrics = Metrics(parent=self.metrics)
+        self.metrics_log = metrics_log
+        self.metrics_file = metrics_file
+        # Per-call timeout, retries with backoff and hedged duplicates (llm.py),
+        # plus a hard limit in seconds on a whole process_resumes batch
+        self.llm = LLMCaller(
+            timeout=request_timeout, max_retries=max_retries,
+            hedge_after=hedge_after, hedge_percentile=hedge_percentile
+        )
+        self.batch_deadline = batch_deadline
+        # LLM client for resume calls; None uses the shared one (llm.get_client)
+        self.client = client
+        # Optional JobStore (job_store.py); each batch becomes a job whose
+        # resumes are committed as they finish, so it can be resumed
+        self.job_store = job_store
+        self.job_id = None
+        self._job_positions = None
+        self._job_incomplete = False
+        # A batch's resumes join self.resumes in input order, whatever order
+        # they finish in, so equal scores always rank the same way: the
+        # batch's slice starts at _batch_start and _batch_keys holds the
+        # input position of each resume in it. A resumed job's slice starts
+        # out with the restored positions (_resumed_keys).
+        self._batch_start = 0
+        self._batch_keys = []
+        self._resumed_keys = None
+        # Resumes repeated in a batch (same bytes or same text; dedup.py)
+        # are extracted once and listed under the first copy instead of
+        # being ranked on their own. Near-duplicates (MinHash similarity
+        # >= dedup_threshold and the same skills found) are grouped only
+        # when a threshold is given: people sharing a template look alike.
+        self.dedup = dedup
+        self.dedup_threshold = dedup_threshold
+        self._dedup_lock = threading.Lock()
+
+    def process_resumes(self, paths: list, concurrency=None, requests_per_minute=None,
+                        batch_token_budget=None):
+        tasks = self._prepare_tasks(paths)[0]
+        if tasks is None:
             return
+
+        # Record each result as it finishes, so a JobStore job keeps
+        # everything done so far if the run dies; return them in input order
+        for _ in self._recorded(tasks, concurrency, requests_per_minute, batch_token_budget):
+            pass
+        processed = [task.resume for task in tasks if task.resume is not None]
+
+        if self.cache is not None:
+            print(f"Cache: {self.cache.hits} hits, {self.cache.misses} misses")
+
+        return processed
+
+    def iter_process_resumes(self, paths: list, concurrency=None, requests_per_minute=None,
+                             batch_token_budget=None):
+        # Streaming variant of process_resumes: yields each Resume (already
+        # added to self.resumes) or ResumeError as soon as it is finished,
+        # in completion order rather than input order.
+        tasks, errors = self._prepare_tasks(paths)
+        if tasks is None:
+            return
+
+        yield from errors
+        yield from self._recorded(tasks, concurrency, requests_per_minute, batch_token_budget)
+
+        if self.cache is not None:
+            print(f"Cache: {self.cache.hits} hits, {self.cache.misses} misses")
+
+    def _recorded(self, tasks, concurrency, requests_per_minute, batch_token_budget):
+        # Runs the pipeline and yields each task's recorded result. Closing
+        # it early (or an error) stops the pipeline and leaves the JobStore
+        # job unfinished, to be resumed.
+        keys, self._resumed_keys = self._resumed_keys, None
+        if keys is not None and len(keys) == len(self.resumes):
+            self._batch_start, self._batch_keys = 0, keys
+        else:
+            self._batch_start, self._batch_keys = len(self.resumes), []
+
+        pipeline = self._run_pipeline(tasks, concurrency, requests_per_minute, batch_token_budget)
+        completed = False
+        try:
+            for task in pipeline:
+                yield self._record(task)
+            completed = True
+        finally:
+            pipeline.close()
+            if not completed:
+                self._job_incomplete = True
+            self._finish_job()
+
+    def _prepare_tasks(self, paths):
+        # Returns (tasks, errors for unreadable inputs), or (None, []) when
+        # there is nothing to do
+        if self.job is None and not self.jobs:
+            print("❌ Please insert a Job Description first!")
+            return None, []
     
         if not paths:
             print("❌ No valid paths entered.")
+            return None, []
+
+        tasks, errors = [], []
+        for index, item in enumerate(paths):
+            try:
+                name, source = resolve_source(item, index)
+            except (TypeError, OSError) as e:
+                print(f"❌ Could not read resume #{index + 1}: {e}")
+                errors.append(ResumeError(index, f"resume_{index + 1}", e))
+                continue
+            if isinstance(source, str) and not os.path.isfile(source):
+                print(f"❌ File not found: {source}")
+                errors.append(ResumeError(index, name, FileNotFoundError(f"File not found: {source}")))
+                continue
+            tasks.append(ResumeTask(task_id=f"R{index}", name=name, source=source, index=index))
+
+        # A job records one job description; multi-JD batches are not stored
+        if self.job_store is not None and self.job is not None:
+            self._start_job(tasks)
+
+        # A fresh per-batch Metrics; it still feeds the running totals
+        self.batch_metrics = Metrics(parent=self.metrics)
+        self.batch_metrics.incr("resumes_failed", len(errors))
+        return tasks, errors
+
+    def _start_job(self, tasks):
+        # Tasks of a resumed job keep their rows; anything else is a new job
+        positions, self._job_positions = self._job_positions, None
+        if positions is not None:
+            for task in tasks:
+                task.job_position = positions[task.index]
             return
-    
-        for path in paths:
-            if not os.path.isfile(path):
-                print(f"❌ File not found: {path}")
+
+        for task in tasks:
+            task.job_position = task.index
+        self.job_id = self.job_store.create_job(
+            self.job.raw_text, self.job.skills, self.job.required_experience,
+            [(task.index, task.name, task.source) for task in tasks]
+        )
+
+    def _finish_job(self):
+        # A job cut short by the batch deadline stays unfinished and is
+        # released, to be resumed
+        if self.job_store is not None and self.job_id is not None:
+            if self._job_incomplete:
+                self.job_store.release(self.job_id)
+            else:
+                self.job_store.finish_job(self.job_id)
+            self.job_id = None
+        self._job_incomplete = False
+
+    def resume_job(self, job_id):
+        # Restores an unfinished JobStore job: its job description (without
+        # calling the LLM) and the resumes already extracted, which go into
+        # self.resumes. Returns the (name, source) inputs still to do; pass
+        # them to process_resumes or iter_process_resumes to finish the job.
+        job = self.job_store.get_job(job_id)
+        if job is None:
+            raise ValueError(f"No job {job_id} in the job store")
+        if not self.job_store.claim(job_id):
+            raise ValueError(f"Job {job_id} is finished or still running in another session")
+
+        self.job = JobDescription(metrics=self.metrics, caller=self.llm, client=self.client)
+        self.job.raw_text = job["jd_text"]
+        self.job.skills = [canonical_skill(s) for s in job["skills"]]
+        self.job.required_experience = job["experience"]
+        # Copies go back under their original instead of being ranked
+        restored, copies = {}, []
+        for position, name, skills, experience, duplicate_of in self.job_store.results(job_id):
+            resume = Resume(name=name, skills=[canonical_skill(s) for s in skills], experience=experience)
+            if duplicate_of is None:
+                restored[position] = resume
+            else:
+                copies.append((resume, duplicate_of))
+        for resume, position in copies:
+            original = restored.get(position)
+            if original is None:
+                restored[position] = resume
                 continue
-        
+            resume.duplicate_of = original.name
+            original.duplicates.append(resume.name)
+        self._resumed_keys = sorted(restored)
+        self.resumes = [restored[position] for position in self._resumed_keys]
+
+        pending = self.job_store.pending(job_id)
+        self.job_id = job_id
+        if not pending:
+            # Nothing left to run, so no batch would ever finish it
+            self._resumed_keys = None
+            self._finish_job()
+            return []
+        self._job_positions = [position for position, _, _ in pending]
+        return [(name, source) for _, name, source in pending]
+
+    def _record(self, task):
+        if task.job_position is not None:
+            if isinstance(task.error, DeadlineExceeded):
+                # Left pending, so resuming the job retries it
+                self._job_incomplete = True
+            elif task.error is not None:
+                self.job_store.mark_failed(self.job_id, task.job_position, task.error)
+            else:
+                original = task.duplicate_of
+                self.job_store.mark_done(
+                    self.job_id, task.job_position, task.skills, task.experience,
+                    duplicate_of=original.job_position if original is not None else None
+                )
+
+        if task.error is not None:
+            self.batch_metrics.incr("resumes_failed")
+            print(f"❌ Error processing {task.name}: {task.error}")
+            return ResumeError(task.index, task.name, task.error)
+
+        self.batch_metrics.incr("resumes_processed")
+        resume = task.resume = task.to_resume()
+        if task.duplicate_of is not None:
+            original = task.duplicate_of
+            resume.duplicate_of = original.name
+            # The original lists its copies; one recorded before it picks them up itself
+            if original.resume is not None and task.name not in original.resume.duplicates:
+                original.resume.duplicates.append(task.name)
+            print(f"♻️ Duplicate of {original.name}: {resume.name}")
+            return resume
+
+        resume.duplicates = [t.name for t in task.duplicates]
+        if self.candidate_index is not None:
+            resume.candidate_id = self.candidate_index.add(
+                resume.name, resume.skills, resume.experience, content_key=task.content_hash
+            )
+        key = task.job_position if task.job_position is not None else task.index
+        at = bisect.bisect(self._batch_keys, key)
+        self._batch_keys.insert(at, key)
+        self.resumes.insert(self._batch_start + at, resume)
+        print(f"✅ Processed: {resume.name}")
+        print(f"   Skills: {resume.skills}")
+        print(f"   Experience: {resume.experience} years")
+        return resume
+
+    def _run_pipeline(self, tasks, concurrency=None, requests_per_minute=None, batch_token_budget=None):
+        # Stage 1 parses PDFs in worker processes and hands cleaned text to
+        # stage 2 (LLM calls on a thread pool) through a bounded queue, so CPU
+        # parsing overlaps network waits and memory stays flat for big batches.
+        # Every task lands on done_queue exactly once, whichever stage
+        # finishes it, and is yielded from there as soon as it is done.
+        # Closing the generator early sets `stop`: both stages then wind
+        # down without starting any more parsing or LLM calls.
+        concurrency = max(1, concurrency or self.concurrency)
+        requests_per_minute = requests_per_minute or self.requests_per_minute
+        limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+        batch_token_budget = batch_token_budget or self.batch_token_budget
+
+        if self.batch_deadline:
+            deadline = time.monotonic() + self.batch_deadline
+            for task in tasks:
+                task.deadline = deadline
+
+        detector = None
+        if self.dedup:
+            from dedup import DuplicateDetector
+            detector = DuplicateDetector(self.dedup_threshold, skill_extractor=self.skill_extractor)
+
+        text_queue = queue.Queue(maxsize=self.queue_size or concurrency * 2)
+        done_queue = queue.Queue()
+        stop = threading.Event()
+        stages = [
+            threading.Thread(
+                target=self._parse_stage, args=(tasks, text_queue, done_queue, detector, stop), daemon=True
+            ),
+            threading.Thread(
+                target=self._llm_stage,
+                args=(text_queue, done_queue, concurrency, limiter, batch_token_budget, stop),
+                daemon=True
+            ),
+        ]
+        for stage in stages:
+            stage.start()
+
+        # A JobStore job's lease is renewed while nothing finishes
+        heartbeat = self.job_store.lease / 4 if self.job_id is not None else None
+        remaining = len(tasks)
+        try:
+            with self.batch_metrics.timer("batch_total"):
+                # Duplicates never reach done_queue before their original does;
+                # they follow it out with its result
+                while remaining:
+                    try:
+                        task = done_queue.get(timeout=heartbeat)
+                    except queue.Empty:
+                        self.job_store.touch(self.job_id)
+                        continue
+                    for finished in [task] + self._release_duplicates(task):
+                        remaining -= 1
+                        yield finished
+
+                for stage in stages:
+                    stage.join()
+        finally:
+            # Set only when the consumer stopped early; the stages are not
+            # waited for, calls already in flight end on their own
+            if remaining:
+                stop.set()
+        self._export_metrics()
+
+    def _export_metrics(self):
+        if self.metrics_log:
+            self.batch_metrics.write_json_log(self.metrics_log, mode=self.extraction_mode)
+        if self.metrics_file:
+            self.metrics.write_prometheus(self.metrics_file)
+
+    def _llm_stage(self, text_queue, done_queue, concurrency, limiter, batch_token_budget, stop):
+        # Every task taken off text_queue is put on done_queue exactly once,
+        # whatever raises on the way. Once `stop` is set nobody reads
+        # done_queue: queued calls are cancelled and text_queue is only
+        # emptied, so the parse stage is never left blocked on it.
+        #
+        # At most concurrency + text_queue.maxsize jobs wait in or run on
+        # the pool; past that this stage stops reading text_queue, which
+        # fills up and holds parsing back.
+        slots = threading.BoundedSemaphore(concurrency + text_queue.maxsize)
+
+        def submit(func, *args):
+            slots.acquire()
+
+            def job():
+                try:
+                    # Jobs still waiting when stop is set are dropped
+                    if not stop.is_set():
+                        func(*args)
+                finally:
+                    slots.release()
+            pool.submit(job)
+
+        def run(step, task):
             try:
-                # Extract text from PDF
-                doc = fitz.open(path)
-                text = ""
-                for page in doc:
-                    text += page.get_text()
-                doc.close()
-        
-                # Clean text
-                text_clean = re.sub(r'\s+', ' ', text).strip()
-        
-                prompt = f"""
-                        Extract ONLY:
-                        1. All technical skills (from Skills section and project tools mentioned in the resume).
-                        2. Total professional experience in years (decimal allowed, e.g., 2.5 for 2 years 6 months).
-                        
-                        Return ONLY valid JSON in this exact format:
-                        {{
-                            "skills": ["skill1", "skill2"],
-                            "experience_years": 0.0
-                        }}
-                        
-                        NO explanations, NO markdown, NO extra text, NO thoughts.
-                        
-                        Resume text:
-                    \"\"\"{text_clean}\"\"\"
-                    """
-        
-                response = self.job.client.chat.completions.create(
-                    model="qwen/qwen3-32b",
+                self._guarded(step, task, limiter)
+            finally:
+                done_queue.put(task)
+
+        def run_batch(batch):
+            try:
+                self._extract_batch(batch, limiter)
+            except Exception as e:
+                for task in batch:
+                    if not task.done:
+                        task.error = e
+            finally:
+                for task in batch:
+                    if not task.done:
+                        task.error = RuntimeError("Batched extraction stopped before this resume")
+                    done_queue.put(task)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            batch, batch_tokens = [], 0
+            while True:
+                task = text_queue.get()
+                if task is None:
+                    break
+                if stop.is_set():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    continue
+
+                if self.extraction_mode == "local":
+                    run(self._extract_local, task)
+                    continue
+                try:
+                    if self.compact_prompts:
+                        self._compact(task)
+                    if self.extraction_mode == "prefill":
+                        task.prefill_skills, task.text = self.skill_extractor.scan(task.text)
+                except Exception as e:
+                    task.error = e
+                    done_queue.put(task)
+                    continue
+
+                if not batch_token_budget:
+                    submit(run, self._extract_task, task)
+                    continue
+
+                cost = estimate_tokens(task.text)
+                if batch and batch_tokens + cost > batch_token_budget:
+                    submit(run_batch, batch)
+                    batch, batch_tokens = [], 0
+                batch.append(task)
+                batch_tokens += cost
+
+            if stop.is_set():
+                pool.shutdown(wait=False, cancel_futures=True)
+            elif batch:
+                submit(run_batch, batch)
+
+    def _attach_duplicate(self, task, original, kind, done_queue):
+        # task is a copy of original: it waits for original's result instead
+        # of being parsed or extracted itself. Anything that can raise comes
+        # before task is linked, so a failure leaves it free to be failed
+        # on its own.
+        while original.duplicate_of is not None:
+            original = original.duplicate_of
+        self.batch_metrics.incr(f"duplicates_{kind}")
+        task.duplicate_of, task.text = original, None
+        with self._dedup_lock:
+            original.duplicates.append(task)
+            if not original.released:
+                return
+        self._copy_result(original, task)
+        done_queue.put(task)
+
+    def _release_duplicates(self, task):
+        # Called once task's result is final; returns its duplicates, now
+        # holding the same result
+        with self._dedup_lock:
+            task.released = True
+            duplicates = list(task.duplicates)
+        for duplicate in duplicates:
+            self._copy_result(task, duplicate)
+        return duplicates
+
+    @staticmethod
+    def _copy_result(original, duplicate):
+        duplicate.skills = list(original.skills) if original.skills is not None else None
+        duplicate.experience = original.experience
+        duplicate.error = original.error
+
+    def _parse_stage(self, tasks, text_queue, done_queue, detector, stop):
+        parse_workers = self.parse_workers if self.parse_workers is not None else os.cpu_count() or 1
+        # A process pool only pays off once there is more than one PDF to parse
+        if parse_workers > 0 and len(tasks) > 1:
+            executor = ProcessPoolExecutor(max_workers=parse_workers)
+        else:
+            parse_workers = 1
+            executor = ThreadPoolExecutor(max_workers=1)
+
+        in_flight = {}
+
+        def drain(done):
+            for future in done:
+                task = in_flight.pop(future)
+                try:
+                    task.text, timings = future.result()
+                    for stage, seconds in timings.items():
+                        self.batch_metrics.record(stage, seconds)
+                    if detector is not None:
+                        with self.batch_metrics.timer("dedup"):
+                            duplicate = detector.check(task, text=task.text)
+                        if duplicate is not None:
+                            self._attach_duplicate(task, *duplicate, done_queue)
+                            continue
+                except Exception as e:
+                    task.error = e
+                    done_queue.put(task)
+                    continue
+                # Blocks while the LLM stage is behind
+                text_queue.put(task)
+
+        pending = deque(tasks)
+        try:
+            with executor:
+                while pending and not stop.is_set():
+                    task = pending.popleft()
+                    try:
+                        data = self._load_task(task)
+                        # Byte-identical files are caught before they are parsed
+                        if detector is not None:
+                            duplicate = detector.check(task, digest=task.content_hash)
+                            if duplicate is not None:
+                                self._attach_duplicate(task, *duplicate, done_queue)
+                                continue
+                    except Exception as e:
+                        task.error = e
+                    if task.done:
+                        done_queue.put(task)
+                        continue
+
+                    try:
+                        future = executor.submit(
+                            extract_pdf_text_timed, data, self.max_pages, self.max_chars, self.compact_prompts
+                        )
+                    except Exception:
+                        # e.g. BrokenProcessPool; the handler below fails it
+                        pending.appendleft(task)
+                        raise
+                    in_flight[future] = task
+                    if len(in_flight) >= parse_workers * 2:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        drain(done)
+
+                if stop.is_set():
+                    # Files not yet being parsed are dropped
+                    executor.shutdown(cancel_futures=True)
+                else:
+                    drain(wait(in_flight)[0])
+        except Exception as e:
+            # Whatever had not reached the LLM stage yet fails with the pool
+            for task in list(in_flight.values()) + list(pending):
+                task.error = e
+                done_queue.put(task)
+        finally:
+            text_queue.put(None)
+
+    def _load_task(self, task):
+        with self.batch_metrics.timer("pdf_read"):
+            if isinstance(task.source, bytes):
+                data = task.source
+            else:
+                with open(task.source, "rb") as f:
+                    data = f.read()
+            task.content_hash = hashlib.sha256(data).hexdigest()
+
+        # Already-seen files skip both PDF parsing and the Groq call.
+        # Local extraction is cheap and deterministic, so it is never cached.
+        if self.cache is not None and self.extraction_mode != "local":
+            prompt_id = RESUME_PROMPT if self.extraction_mode != "prefill" else "prefill" + RESUME_PROMPT
+            if self.compact_prompts:
+                prompt_id += f"|compact:{self.prompt_token_budget}"
+            task.cache_key = self.cache.make_key(data, prompt_id, MODEL_NAME)
+            with self.batch_metrics.timer("cache_lookup"):
+                cached = self.cache.get(task.cache_key)
+            if cached is not None:
+                self.batch_metrics.incr("cache_hits")
+                # Re-mapped in case the synonym dictionary changed since caching
+                skills, task.experience = cached
+                task.skills = list(dict.fromkeys(canonicalize_skill(s) for s in skills))
+            else:
+                self.batch_metrics.incr("cache_misses")
+
+        return data
+
+    def _compact(self, task):
+        with self.batch_metrics.timer("compact"):
+            task.text, report = compact_resume(task.text, self.prompt_token_budget)
+        self.batch_metrics.incr("prompt_tokens_before_compaction", report["tokens_before"])
+        self.batch_metrics.incr("prompt_tokens_after_compaction", report["tokens_after"])
+
+    @staticmethod
+    def _guarded(step, task, limiter=None):
+        # Never let one bad file stop the rest of the batch
+        try:
+            step(task, limiter)
+        except Exception as e:
+            task.error = e
+
+    def _complete(self, system_prompt, prompt, limiter=None, deadline=None):
+        metrics = self.batch_metrics
+        if limiter is not None:
+            try:
+                with metrics.timer("rate_limit_wait"):
+                    limiter.wait(deadline)
+            except DeadlineExceeded:
+                metrics.incr("deadline_exceeded")
+                raise
+
+        metrics.incr("llm_requests")
+        try:
+            with metrics.timer("llm"):
+                response = self.llm.call(
+                    self.client if self.client is not None else get_client(),
+                    deadline=deadline,
+                    metrics=metrics,
+                    limiter=limiter,
+                    model=MODEL_NAME,
                     temperature=0,
                     messages=[
-                        {"role": "system", "content": "Extract structured resume info."},
+                        {"role": "system", "content": system_prompt},
                         {"role": "user", "content": prompt}
                     ],
                     reasoning_effort="none"
                 )
-        
-                output_text = response.choices[0].message.content.strip()
-        
-                output_text = re.sub(r"<think>.*?</think>", "", output_text, flags=re.DOTALL).strip()
-        
-                if not output_text.startswith("{"):
-                    raise ValueError("AI output is not valid JSON. Check the model response.")
-        
-                result = json.loads(output_text)
-        
-                skills = [canonicalize_skill(normalize_skill(s)) for s in result.get("skills", [])]
-                experience = result.get("experience_years", 0)
+        except Exception:
+            metrics.incr("llm_errors")
+            raise
+        metrics.add_tokens("resume", getattr(response, "usage", None))
+
+        return strip_thinking(response.choices[0].message.content.strip())
+
+    def _extract_local(self, task, limiter=None):
+        with self.batch_metrics.timer("local_extract"):
+            task.skills = self.skill_extractor.extract(task.text)
+            task.experience = estimate_experience(task.text)
+
+    def _extract_task(self, task, limiter=None):
+        try:
+            output_text = self._complete(
+                "Extract structured resume info.",
+                RESUME_PROMPT.format(text=task.text),
+                limiter,
+                task.deadline
+            )
+        except Exception as e:
+            if self.extraction_mode != "fallback":
+                raise
+            print(f"⚠️ LLM unavailable for {task.name}, using local extraction: {e}")
+            self.batch_metrics.incr("local_fallbacks")
+            self._extract_local(task)
+            return
+
+        if not output_text.startswith("{"):
+            raise ValueError("AI output is not valid JSON. Check the model response.")
+
+        with self.batch_metrics.timer("llm_json"):
+            result = parse_resume_result(json.loads(output_text))
+        self._finish_task(task, *result)
+
+    def _extract_batch(self, batch, limiter=None):
+        if len(batch) == 1:
+            self._guarded(self._extract_task, batch[0], limiter)
+            return
+
+        resumes_block = "\n".join(
+            f'RESUME ID: {task.task_id}\n"""{task.text}"""' for task in batch
+        )
+        try:
+            output_text = self._complete(
+                "Extract structured resume info for several resumes.",
+                RESUME_BATCH_PROMPT.format(resumes=resumes_block),
+                limiter,
+                batch[0].deadline
+            )
+        except Exception as e:
+            print(f"❌ Batched request failed, retrying resumes individually: {e}")
+            output_text = ""
+
+        with self.batch_metrics.timer("llm_json"):
+            parsed = parse_batch_output(output_text, {task.task_id for task in batch})
+        for task in batch:
+            if task.task_id in parsed:
+                # One task failing to finish must not stop the rest of the batch
                 try:
-                    experience = round(float(experience), 1)
-                except:
-                    experience = 0.0
-        
-                resume_name = os.path.basename(path)
-                self.resumes.append(
-                    Resume(name=resume_name, skills=skills, experience=experience)
-                )
-        
-                print(f"✅ Processed: {resume_name}")
-                print(f"   Skills: {skills}")
-                print(f"   Experience: {experience} years")
-        
+                    self._finish_task(task, *parsed[task.task_id])
+                except Exception as e:
+                    task.error = e
+            else:
+                # Left out or garbled by the batched answer: retry it alone
+                self.batch_metrics.incr("batch_retries")
+                self._guarded(self._extract_task, task, limiter)
+
+    def _finish_task(self, task, skills, experience):
+        if task.prefill_skills:
+            skills = task.prefill_skills + [s for s in skills if s not in task.prefill_skills]
+        task.skills, task.experience = skills, experience
+        if task.cache_key is not None:
+            # The result stands even if it cannot be cached (e.g. "database is locked")
+            try:
+                self.cache.put(task.cache_key, skills, experience)
             except Exception as e:
-                print(f"❌ Error processing {path}: {e}")
+                self.batch_metrics.incr("cache_errors")
+                print(f"⚠️ Could not cache {task.name}: {e}")
+
     # Inside ResumeRankingSystem class
 
     def calculate_scores(self):
@@ -228,40 +1103,151 @@ class ResumeRankingSystem:
         if not self.resumes:
             raise ValueError("No resumes to score!")
     
-        for resume in self.resumes:
-            required_skills = set(self.job.skills)
-            candidate_skills = set(resume.skills)
-            
-            matched_skills = required_skills.intersection(candidate_skills)
-            missing_skills = required_skills - matched_skills
-            
-            skill_match_pct = (
-                len(matched_skills) / len(required_skills) * 100
-                if required_skills else 0
-            )
-    
-            if self.job.required_experience > 0:
-                exp_ratio = resume.experience / self.job.required_experience
-                exp_score_pct = min(exp_ratio * 100, 100)
-            else:
-                exp_score_pct = 0.0
-    
-            final_score = skill_match_pct * 0.7 + exp_score_pct * 0.3
-    
-            resume.skill_match_pct = round(skill_match_pct, 1)
-            resume.exp_score_pct = round(exp_score_pct, 1)
-            resume.score = round(final_score, 1)
-    
-            resume.matched_skills = list(matched_skills)
-            resume.missing_skills = list(missing_skills)
+        with self._scoring_lock:
+            with self.batch_metrics.timer("scoring"):
+                result = self.scoring_engine.score(
+                    self.resumes, self.job.skills, self.job.required_experience
+                )
+
+            for i, resume in enumerate(self.resumes):
+                resume.skill_match_pct = result.skill_match_pct[i]
+                resume.exp_score_pct = result.exp_score_pct[i]
+                resume.score = result.score[i]
+
+                resume.matched_skills = result.matched[i]
+                resume.missing_skills = result.missing[i]
+                resume.missing_must_have = result.missing_must_have[i]
+
+            self.resumes = [self.resumes[i] for i in result.order]
+
+        return self.resumes
     
-        self.resumes.sort(
-            key=lambda r: (r.score, r.skill_match_pct, r.exp_score_pct),
-            reverse=True
+    def top_k(self, k=20, min_score=None):
+        # Best k candidates (optionally only those scoring >= min_score),
+        # ranked exactly like calculate_scores but without sorting or
+        # scoring the whole pool in Python. self.resumes is left untouched.
+        if self.job is None:
+            raise ValueError("Please insert a Job Description first!")
+
+        if not self.resumes:
+            raise ValueError("No resumes to score!")
+
+        with self._scoring_lock:
+            resumes = self.resumes
+            with self.batch_metrics.timer("scoring"):
+                result = self.scoring_engine.top_k(
+                    resumes, self.job.skills, self.job.required_experience, k, min_score=min_score
+                )
+
+            ranked = []
+            for i, index in enumerate(result.order.tolist()):
+                resume = resumes[index]
+                resume.skill_match_pct = result.skill_match_pct[i]
+                resume.exp_score_pct = result.exp_score_pct[i]
+                resume.score = result.score[i]
+                resume.matched_skills = result.matched[i]
+                resume.missing_skills = result.missing[i]
+                resume.missing_must_have = result.missing_must_have[i]
+                ranked.append(resume)
+
+        return ranked
+
+    @property
+    def scoring_engine(self):
+        # Created lazily so numpy is only imported once something is scored
+        if self._scoring_engine is None:
+            from scoring import ScoringEngine
+            self._scoring_engine = ScoringEngine()
+        return self._scoring_engine
+
+    @scoring_engine.setter
+    def scoring_engine(self, engine):
+        self._scoring_engine = engine
+
+    def configure_scoring(self, skill_weight=None, experience_weight=None, experience_cap=None,
+                          must_have=None, fuzzy=None, fuzzy_threshold=None):
+        # Changes how extracted data is scored; arguments left as None keep
+        # their current value. Nothing is re-extracted, so calculate_scores
+        # or top_k can re-rank straight away. experience_cap is the highest
+        # experience score in % of the required years; candidates missing
+        # any must_have skill rank below all that have every one. fuzzy
+        # also counts near-identical skill names as matches (fuzzy.py).
+        if must_have is not None:
+            must_have = [canonical_skill(s) for s in must_have]
+        self.scoring_engine.configure(
+            skill_weight=skill_weight, experience_weight=experience_weight,
+            experience_cap=experience_cap, must_have=must_have,
+            fuzzy=fuzzy, fuzzy_threshold=fuzzy_threshold
         )
-    
+
+    def rank_stored_candidates(self, k=20, must_have=()):
+        # Ranks the whole stored pool against the current JD from the
+        # inverted index alone; no resume is re-extracted. Uses the current
+        # scoring weights with exact skill matching; must_have here filters
+        # the pool instead.
+        if self.job is None:
+            raise ValueError("Please insert a Job Description first!")
+
+        if self.candidate_index is None or not len(self.candidate_index):
+            raise ValueError("No stored candidates to rank!")
+
+        with self.batch_metrics.timer("index_query"):
+            engine = self.scoring_engine
+            self.resumes = self.candidate_index.query(
+                self.job.skills, self.job.required_experience, k=k, must_have=must_have,
+                skill_weight=engine.skill_weight, experience_weight=engine.experience_weight,
+                experience_cap=engine.experience_cap
+            )
         return self.resumes
-    
+
+    def rank_jobs(self, k=20, best=3):
+        # Ranks the pool against every JobDescription in self.jobs at once,
+        # without re-extracting any resume. Returns (rankings, best_fit):
+        # rankings[j] holds the best k JobMatch objects for self.jobs[j], in
+        # the order top_k would give for that job alone, and best_fit[i] the
+        # `best` best-fitting jobs for self.resumes[i]. Uses the current
+        # scoring settings with exact skill matching. self.resumes and its
+        # Resume score fields are left untouched.
+        if not self.jobs:
+            raise ValueError("Please insert a Job Description first!")
+
+        if not self.resumes:
+            raise ValueError("No resumes to score!")
+
+        with self._scoring_lock:
+            resumes = self.resumes
+            with self.batch_metrics.timer("scoring"):
+                result = self.scoring_engine.score_jobs(
+                    resumes, [(job.skills, job.required_experience) for job in self.jobs], k=k, best=best
+                )
+
+            def matches(pairs):
+                rows = [i for i, _ in pairs]
+                cols = [j for _, j in pairs]
+                values = zip(*result.values(rows, cols)) if pairs else []
+                out = []
+                for (i, j), (skill, exp, score) in zip(pairs, values):
+                    resume, required = resumes[i], result.required[j]
+                    have = set(resume.skills)
+                    out.append(JobMatch(
+                        resume, j, self.jobs[j], score, skill, exp,
+                        [s for s in required if s in have], [s for s in required if s not in have],
+                        result.missing_must_have[i] if result.missing_must_have else []
+                    ))
+                return out
+
+            # Scores are rounded in two batches, one per output
+            ranked = matches([(i, j) for j, ranking in enumerate(result.rankings) for i in ranking.tolist()])
+            fits = matches([(i, j) for i, row in enumerate(result.best_fit.tolist()) for j in row])
+
+            rankings, start = [], 0
+            for ranking in result.rankings:
+                rankings.append(ranked[start:start + len(ranking)])
+                start += len(ranking)
+            best_fit = [fits[i * result.best_fit.shape[1]:(i + 1) * result.best_fit.shape[1]] for i in range(len(resumes))]
+
+        return rankings, best_fit
+
     def show_sorted_results(self):
         if not self.resumes:
             print("❌ No resumes to display!")
@@ -275,5 +1261,11 @@ class ResumeRankingSystem:
         
     def reset_system(self):
         self.job = None
+        self.jobs = []
         self.resumes = []
+        self.job_id = None
+        if self._scoring_engine is not None:
+            # Same settings, without the previous pool's skill matrix
+            self._scoring_engine = type(self._scoring_engine)(**self._scoring_engine.settings())
+        self.batch_metrics = Metrics(parent=self.metrics)
         print("✅ System reset: Job Description and all resumes cleared.")
\ No newline at end of file
@@ -0,0 +1,132 @@
+# dedup.py
+import re
+import zlib
+import hashlib
+
+import numpy as np
+
+from skills import SkillExtractor
+
+# Words per shingle; resumes are short, so 3 keeps one edited word from
+# changing more than a handful of shingles
+SHINGLE_SIZE = 3
+# MinHash signature length, split into BANDS bands of NUM_PERM // BANDS
+# values for locality-sensitive hashing. With 32 bands of 4, texts whose
+# Jaccard similarity is 0.8 share a band with probability ~1, texts at 0.3
+# only about one time in four (and are then rejected on the full signature).
+NUM_PERM = 128
+BANDS = 32
+# Estimated Jaccard similarity of word shingles needed for a near-duplicate.
+# Near-duplicate grouping is opt-in (ResumeRankingSystem(dedup_threshold=...)):
+# resumes of different people built on one template can score this high.
+DEFAULT_THRESHOLD = 0.8
+
+_WORD = re.compile(r"\w+")
+
+
+def normalized_text(text):
+    # Case and whitespace do not make two resumes different
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    # 32-bit hashes of the unique word shingles of an already normalized text
+    words = text.split()
+    if len(words) <= size:
+        shingles = [" ".join(words)] if words else []
+    else:
+        shingles = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return np.unique(np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles)
+    ))
+
+
+class DuplicateDetector:
+    # Groups inputs that are the same resume: identical bytes, identical
+    # text after normalization, or (unless threshold is None) text whose
+    # MinHash signatures estimate a word-shingle Jaccard similarity of at
+    # least `threshold` and in which skill_extractor (skills.py) finds the
+    # same skills, so people sharing a template are not merged. Each new
+    # input is compared only with earlier ones sharing a digest or an LSH
+    # band, so the cost per input stays flat as the batch grows.
+    #
+    # check() returns (earlier input, "exact" or "near") when an item
+    # duplicates one seen before, or registers it and returns None. Not
+    # thread-safe; the parse stage is its only caller.
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, bands=BANDS, seed=1, skill_extractor=None):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.skill_extractor = skill_extractor
+        self.bands = bands
+        self.rows = num_perm // bands
+        # Multiply-shift hashing: (a * x + b) mod 2**64, top 32 bits
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._digests = {}
+        self._buckets = {}
+        self._signatures = []
+        self._skills = []
+        self._items = []
+
+    def signature(self, text):
+        # MinHash signature of a normalized text, or None when it has no words
+        hashes = shingle_hashes(text)
+        if not len(hashes):
+            return None
+        with np.errstate(over="ignore"):
+            values = (hashes[:, None] * self._a + self._b) >> np.uint64(32)
+        return values.min(axis=0)
+
+    def skills(self, text):
+        # The skills a near-duplicate must share, as a sorted tuple
+        if self.skill_extractor is None:
+            self.skill_extractor = SkillExtractor()
+        return tuple(sorted(set(self.skill_extractor.extract(text))))
+
+    def check(self, item, digest=None, text=None):
+        # digest: hash of the raw bytes; text: the extracted text
+        if digest is not None:
+            original = self._digests.setdefault(("bytes", digest), item)
+            if original is not item:
+                return original, "exact"
+        if text is None:
+            return None
+
+        raw_text, text = text, normalized_text(text)
+        text_digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        original = self._digests.setdefault(("text", text_digest), item)
+        if original is not item:
+            return original, "exact"
+        if self.threshold is None:
+            return None
+
+        skills = self.skills(raw_text)
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        keys = [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+        best, best_similarity = None, 0.0
+        seen = set()
+        for key in keys:
+            for index in self._buckets.get(key, ()):
+                if index in seen:
+                    continue
+                seen.add(index)
+                if self._skills[index] != skills:
+                    continue
+                similarity = float(np.mean(self._signatures[index] == signature))
+                if similarity >= self.threshold and similarity > best_similarity:
+                    best, best_similarity = index, similarity
+        if best is not None:
+            return self._items[best], "near"
+
+        index = len(self._items)
+        self._items.append(item)
+        self._signatures.append(signature)
+        self._skills.append(skills)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(index)
+        return None
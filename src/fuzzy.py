@@ -0,0 +1,124 @@
+# fuzzy.py
+import threading
+from collections import Counter
+
+import numpy as np
+
+# Character n-gram length; skills are padded with a space on both sides so
+# word starts and ends count as n-grams too
+NGRAM_SIZE = 3
+# Cosine similarity needed for a fuzzy match. "postgres"/"postgresql" and
+# "tensorflow 2"/"tensorflow" clear it; "java"/"javascript" and
+# "react"/"react native" do not.
+DEFAULT_THRESHOLD = 0.75
+
+
+def ngrams(skill, n=NGRAM_SIZE):
+    padded = f" {skill} "
+    if len(padded) <= n:
+        return [padded]
+    return [padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+
+class FuzzyMatcher:
+    # Skill similarity from character n-gram vectors computed locally; no
+    # model or network call. Each unique skill is vectorized once (L2
+    # normalized n-gram counts) and kept for the life of the matcher.
+    #
+    # Vectors are stored as sparse (row, n-gram, weight) entries with an
+    # inverted index by n-gram, so comparing a query against every known
+    # skill is a sparse matrix product that only touches skills sharing at
+    # least one n-gram with it.
+    def __init__(self, n=NGRAM_SIZE):
+        self.n = n
+        self._rows = {}
+        self._gram_ids = {}
+        self._row_start = [0]
+        self._entry_gram = []
+        self._entry_weight = []
+        self._index = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _add(self, skill):
+        counts = Counter(ngrams(skill, self.n))
+        norm = sum(c * c for c in counts.values()) ** 0.5
+        for gram, count in counts.items():
+            self._entry_gram.append(self._gram_ids.setdefault(gram, len(self._gram_ids)))
+            self._entry_weight.append(count / norm)
+        row = self._rows[skill] = len(self._rows)
+        self._row_start.append(len(self._entry_gram))
+        self._index = None
+        return row
+
+    def rows(self, skills):
+        # Vector row of each skill, vectorizing the ones not seen before
+        with self._lock:
+            rows = self._rows
+            return np.fromiter(
+                (rows[s] if s in rows else self._add(s) for s in skills), dtype=np.int64, count=len(skills)
+            )
+
+    def _inverted(self):
+        # Entries grouped by n-gram: rows and weights sorted by n-gram id,
+        # plus where each n-gram's run starts. Rebuilt after new skills.
+        if self._index is None:
+            grams = np.array(self._entry_gram, dtype=np.int64)
+            weights = np.array(self._entry_weight, dtype=np.float64)
+            row_start = np.array(self._row_start, dtype=np.int64)
+            entry_row = np.repeat(np.arange(len(self._rows)), np.diff(row_start))
+            order = np.argsort(grams, kind="stable")
+            starts = np.searchsorted(grams[order], np.arange(len(self._gram_ids) + 1))
+            self._index = (grams, weights, row_start, entry_row[order], weights[order], starts)
+        return self._index
+
+    def similar(self, queries, skills, threshold=DEFAULT_THRESHOLD):
+        # Every (query index, skill index, similarity) pair with cosine
+        # similarity >= threshold, as three arrays. queries and skills are
+        # lists of skill names; identical names always pair with 1.0.
+        skill_rows = self.rows(skills)
+        query_rows = self.rows(queries)
+        with self._lock:
+            grams, weights, row_start, by_gram_row, by_gram_weight, starts = self._inverted()
+
+        position = np.full(len(row_start) - 1, -1, dtype=np.int64)
+        position[skill_rows] = np.arange(len(skills))
+
+        out_query, out_skill, out_sim = [], [], []
+        for q, row in enumerate(query_rows.tolist()):
+            q_grams = grams[row_start[row]:row_start[row + 1]]
+            q_weights = weights[row_start[row]:row_start[row + 1]]
+            lengths = starts[q_grams + 1] - starts[q_grams]
+            if not lengths.sum():
+                continue
+            entries = np.concatenate([np.arange(starts[g], starts[g + 1]) for g in q_grams.tolist()])
+            found = position[by_gram_row[entries]]
+            products = by_gram_weight[entries] * np.repeat(q_weights, lengths)
+            listed = found >= 0
+            matched, inverse = np.unique(found[listed], return_inverse=True)
+            sims = np.bincount(inverse, weights=products[listed], minlength=len(matched))
+            # Rounding can leave an identical vector a hair under 1.0
+            close = sims >= threshold - 1e-9
+            out_query.append(np.full(int(close.sum()), q, dtype=np.int64))
+            out_skill.append(matched[close])
+            out_sim.append(np.minimum(sims[close], 1.0))
+
+        if not out_query:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0)
+        return np.concatenate(out_query), np.concatenate(out_skill), np.concatenate(out_sim)
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher():
+    # Process-wide matcher, so every ScoringEngine shares one vector cache
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = FuzzyMatcher()
+        return _matcher
@@ -0,0 +1,215 @@
+# job_store.py
+import os
+import json
+import time
+import sqlite3
+import threading
+
+DEFAULT_JOB_STORE_PATH = os.path.join(".cache", "jobs.sqlite3")
+# Seconds a running job stays owned by its session without a heartbeat;
+# after that it counts as interrupted and another session may resume it
+DEFAULT_LEASE = 120
+
+# Job status
+RUNNING = "running"
+FINISHED = "finished"
+DISCARDED = "discarded"
+
+# Resume status
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobStore:
+    # Durable record of ranking jobs: the job description with its
+    # extracted requirements and, per resume, where to read it from, its
+    # extraction status and its result. Every finished resume is committed
+    # on its own (WAL journal), so a crash or restart loses only the
+    # resumes still in flight and an unfinished job can be picked up from
+    # its pending rows.
+    #
+    # Uploaded files have no path to go back to, so their bytes are kept
+    # with the row until the job is finished or discarded.
+    #
+    # A running job is leased to the session running it for `lease`
+    # seconds, renewed by every recorded resume and by touch(). Only jobs
+    # whose lease has run out (or was given up with release()) are listed
+    # as unfinished, and claim() lets just one session take one over.
+    def __init__(self, path=DEFAULT_JOB_STORE_PATH, lease=DEFAULT_LEASE):
+        self.path = path
+        self.lease = lease
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # One shared connection guarded by a lock; workers call in from threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # With WAL this still survives an application crash; only an OS
+        # crash or power loss can drop the last few commits
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                status TEXT NOT NULL,
+                jd_text TEXT NOT NULL,
+                jd_skills TEXT NOT NULL,
+                jd_experience REAL NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                lease_until REAL NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS job_resumes (
+                job_id INTEGER NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                path TEXT,
+                data BLOB,
+                status TEXT NOT NULL,
+                skills TEXT,
+                experience REAL,
+                error TEXT,
+                duplicate_of INTEGER,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (job_id, position)
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+        """)
+        self._conn.commit()
+
+    def create_job(self, jd_text, skills, experience, resumes):
+        # resumes is [(position, name, path or bytes)]; returns the job id
+        now = time.time()
+        with self._lock, self._conn:
+            job_id = self._conn.execute(
+                "INSERT INTO jobs (status, jd_text, jd_skills, jd_experience, created_at, updated_at, lease_until) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (RUNNING, jd_text, json.dumps(skills), float(experience), now, now, now + self.lease)
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO job_resumes (job_id, position, name, path, data, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (job_id, position, name,
+                     source if isinstance(source, str) else None,
+                     None if isinstance(source, str) else sqlite3.Binary(source),
+                     PENDING, now)
+                    for position, name, source in resumes
+                ]
+            )
+        return job_id
+
+    def mark_done(self, job_id, position, skills, experience, duplicate_of=None):
+        # duplicate_of: position of the resume this one is a copy of
+        self._update_resume(
+            job_id, position, "status = ?, skills = ?, experience = ?, duplicate_of = ?, data = NULL",
+            (DONE, json.dumps(skills), float(experience), duplicate_of)
+        )
+
+    def mark_failed(self, job_id, position, error):
+        self._update_resume(job_id, position, "status = ?, error = ?", (FAILED, str(error)))
+
+    def claim(self, job_id):
+        # Takes the lease of a running job nobody holds; False if the job
+        # is finished or another session still holds it
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = ? AND lease_until <= ?",
+                (now + self.lease, job_id, RUNNING, now)
+            )
+        return cursor.rowcount == 1
+
+    def touch(self, job_id):
+        # Heartbeat: renews the lease while no resume has finished for a while
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET lease_until = ? WHERE id = ?", (time.time() + self.lease, job_id))
+
+    def release(self, job_id):
+        # Gives up the lease of a job left unfinished on purpose, so it is
+        # offered for resuming at once
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET lease_until = 0 WHERE id = ?", (job_id,))
+
+    def finish_job(self, job_id, status=FINISHED):
+        # Pending rows stay as they are for the record; uploads are dropped
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?", (status, now, job_id))
+            self._conn.execute("UPDATE job_resumes SET data = NULL WHERE job_id = ?", (job_id,))
+
+    def get_job(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, jd_text, jd_skills, jd_experience, created_at, updated_at "
+                "FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM job_resumes WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+        return {
+            "id": row[0],
+            "status": row[1],
+            "jd_text": row[2],
+            "skills": json.loads(row[3]),
+            "experience": row[4],
+            "created_at": row[5],
+            "updated_at": row[6],
+            "total": sum(counts.values()),
+            "done": counts.get(DONE, 0),
+            "failed": counts.get(FAILED, 0),
+            "pending": counts.get(PENDING, 0),
+        }
+
+    def unfinished_jobs(self):
+        # Jobs still marked running that no session holds, newest first
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND lease_until <= ? ORDER BY id DESC",
+                (RUNNING, time.time())
+            ).fetchall()]
+        return [self.get_job(job_id) for job_id in ids]
+
+    def results(self, job_id):
+        # [(position, name, skills, experience, duplicate_of)] for finished
+        # resumes; duplicate_of is the position of the original or None
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT position, name, skills, experience, duplicate_of FROM job_resumes "
+                "WHERE job_id = ? AND status = ? ORDER BY position", (job_id, DONE)
+            ).fetchall()
+        return [
+            (position, name, json.loads(skills), experience, duplicate_of)
+            for position, name, skills, experience, duplicate_of in rows
+        ]
+
+    def pending(self, job_id):
+        # [(position, name, path or bytes)] still to be extracted, in input order
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT position, name, path, data FROM job_resumes "
+                "WHERE job_id = ? AND status = ? ORDER BY position", (job_id, PENDING)
+            ).fetchall()
+        return [
+            (position, name, path if path is not None else bytes(data))
+            for position, name, path, data in rows if path is not None or data is not None
+        ]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _update_resume(self, job_id, position, assignments, values):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE job_resumes SET {assignments}, updated_at = ? WHERE job_id = ? AND position = ?",
+                (*values, now, job_id, position)
+            )
+            self._conn.execute(
+                "UPDATE jobs SET updated_at = ?, lease_until = ? WHERE id = ?", (now, now + self.lease, job_id)
+            )
@@ -0,0 +1,206 @@
+# llm.py
+import os
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Open HTTP connections kept by the shared client; GROQ_MAX_CONNECTIONS
+# overrides it. Matches LLMCaller's default max_workers.
+DEFAULT_MAX_CONNECTIONS = 32
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+def is_retryable(error):
+    # Timeouts, dropped connections, 429 and 5xx answers can succeed on a
+    # later attempt; any other API error (400, 401, 404, ...) never will.
+    # The SDK's timeout and connection errors subclass neither TimeoutError
+    # nor ConnectionError, so they are matched by name.
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    name = type(error).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+class LLMCaller:
+    # Runs chat completion requests with an optional per-call timeout,
+    # retries with jittered exponential backoff, hedging and a hard
+    # deadline. With none of them set it is a plain pass-through call.
+    #
+    # Hedging: when the first request has not answered after `hedge_after`
+    # seconds (or, once hedge_min_samples calls have been seen, after the
+    # hedge_percentile of recent latencies) a duplicate is sent and the
+    # first answer wins. The loser is left to finish in the background.
+    #
+    # Only errors is_retryable() accepts are retried. Pass the run's
+    # RateLimiter as `limiter` and every retry waits for a request slot and
+    # a hedge is sent only when a slot is free at once; the caller still
+    # takes the first attempt's slot itself.
+    def __init__(self, timeout=None, max_retries=0, backoff=0.5, max_backoff=8.0,
+                 hedge_after=None, hedge_percentile=None, hedge_min_samples=20, max_workers=32):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_after = hedge_after
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.max_workers = max_workers
+        self._latencies = deque(maxlen=500)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def hedge_delay(self):
+        if self.hedge_percentile is not None:
+            with self._lock:
+                samples = sorted(self._latencies)
+            if len(samples) >= self.hedge_min_samples:
+                return samples[min(len(samples) - 1, int(len(samples) * self.hedge_percentile / 100))]
+        return self.hedge_after
+
+    def call(self, client, deadline=None, metrics=None, limiter=None, **request):
+        # deadline is a time.monotonic() value; no attempt or backoff sleep
+        # runs past it, and DeadlineExceeded is raised once it has passed
+        attempt = 0
+        while True:
+            if attempt and limiter is not None:
+                try:
+                    limiter.wait(deadline)
+                except DeadlineExceeded:
+                    self._incr(metrics, "deadline_exceeded")
+                    raise
+
+            timeout = self.timeout
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._incr(metrics, "deadline_exceeded")
+                    raise DeadlineExceeded("Batch deadline passed before the LLM answered")
+                timeout = remaining if timeout is None else min(timeout, remaining)
+
+            try:
+                return self._attempt(client, request, timeout, metrics, limiter)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    if deadline is not None and time.monotonic() >= deadline:
+                        self._incr(metrics, "deadline_exceeded")
+                        raise DeadlineExceeded("Batch deadline passed before the LLM answered") from e
+                    raise
+
+                attempt += 1
+                delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    self._incr(metrics, "deadline_exceeded")
+                    raise DeadlineExceeded("Batch deadline passed before the LLM answered") from e
+                self._incr(metrics, "llm_retries")
+                time.sleep(delay)
+
+    def _attempt(self, client, request, timeout, metrics, limiter=None):
+        hedge_delay = self.hedge_delay()
+        start = time.monotonic()
+        if timeout is None and hedge_delay is None:
+            response = client.chat.completions.create(**request)
+            self._observe(time.monotonic() - start)
+            return response
+
+        if timeout is not None:
+            # Also bounds the HTTP request itself, so abandoned calls end too
+            request = {**request, "timeout": timeout}
+        executor = self._pool()
+        futures = [executor.submit(client.chat.completions.create, **request)]
+        end = None if timeout is None else start + timeout
+
+        if hedge_delay is not None and (timeout is None or hedge_delay < timeout):
+            done, _ = wait(futures, timeout=hedge_delay)
+            if not done and (limiter is None or limiter.try_acquire()):
+                self._incr(metrics, "llm_hedges")
+                futures.append(executor.submit(client.chat.completions.create, **request))
+
+        pending, error = set(futures), None
+        while pending:
+            remaining = None if end is None else max(0.0, end - time.monotonic())
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    if future is not futures[0]:
+                        self._incr(metrics, "llm_hedge_wins")
+                    self._observe(time.monotonic() - start)
+                    return future.result()
+                error = future.exception()
+
+        if not pending and error is not None:
+            # The SDK's own timeout error does not subclass TimeoutError
+            if isinstance(error, TimeoutError) or "Timeout" in type(error).__name__:
+                self._incr(metrics, "llm_timeouts")
+            raise error
+        self._incr(metrics, "llm_timeouts")
+        raise TimeoutError(f"LLM call timed out after {timeout:.1f}s")
+
+    def _observe(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    @staticmethod
+    def _incr(metrics, name):
+        if metrics is not None:
+            metrics.incr(name)
+
+
+def make_client(api_key=None, max_connections=None):
+    # A Groq client with a keep-alive connection pool of max_connections.
+    # The SDK's own retries are off: LLMCaller retries, so they would
+    # multiply its attempts and slip past the rate limiter. groq, httpx and
+    # dotenv are imported here, on first use, to keep startup fast.
+    from dotenv import load_dotenv
+    from groq import DefaultHttpxClient, Groq
+    import httpx
+
+    # load variables from .env file
+    load_dotenv()
+
+    if max_connections is None:
+        max_connections = int(os.getenv("GROQ_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS))
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    return Groq(
+        api_key=api_key or os.getenv("GROQ_API_KEY"),
+        http_client=DefaultHttpxClient(limits=limits),
+        max_retries=0
+    )
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    # Process-wide client, built on first use. It is thread-safe, so every
+    # JobDescription, ResumeRankingSystem, worker thread and Streamlit
+    # session shares its connection pool and TLS sessions.
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = make_client()
+        return _client
+
+
+def set_client(client):
+    # Replaces the shared client, e.g. with a local stub such as the
+    # benchmarks' FakeGroq; None builds a fresh one on the next get_client
+    global _client
+    with _client_lock:
+        _client = client
@@ -1,196 +1,319 @@
 import streamlit as st
-from classes import ResumeRankingSystem, JobDescription
+# pandas, PyMuPDF and groq are imported where first needed, so the landing
+# page renders without them
+from classes import ResumeRankingSystem, JobDescription, ResumeError
+from cache import DEFAULT_JD_CACHE_PATH, ExtractionCache
+from job_store import DISCARDED, JobStore
 import os
-import pandas as pd
 import base64
+import time
 from pathlib import Path
 os.chdir(Path(__file__).parent.parent)
+# Logo and global CSS
+STATIC_DIR = Path(__file__).parent.parent / "static"
+
+# Resumes extracted in parallel and Groq request cap per minute
+RESUME_CONCURRENCY = 4
+RESUME_REQUESTS_PER_MINUTE = 30
+# Set to e.g. 6000 to pack several resumes into one Groq request
+RESUME_BATCH_TOKEN_BUDGET = None
+# Only the skills/experience/summary/projects sections are sent to the model,
+# capped at this many estimated tokens per resume
+RESUME_COMPACT_PROMPTS = True
+RESUME_PROMPT_TOKEN_BUDGET = 1500
+# Seconds before a Groq call is abandoned and retried (with jittered backoff),
+# and the latency percentile after which a duplicate request is raced against
+# a slow one. Retries wait for a rate-limit slot; a hedged duplicate uses a
+# spare slot and is skipped when none is free.
+RESUME_REQUEST_TIMEOUT = 60
+RESUME_MAX_RETRIES = 2
+RESUME_HEDGE_PERCENTILE = 95
+# Hard limit in seconds for one Analyze Resumes run, on top of the time the
+# request cap alone needs (one request per resume at RESUME_REQUESTS_PER_MINUTE),
+# so a large upload is not cut off by the rate limit itself
+RESUME_BATCH_DEADLINE = 900
+# How many stored candidates to show when ranking the saved pool
+STORED_POOL_TOP_K = 100
+# Page sizes offered on the results page; recruiters mostly look at the top 20
+RESULTS_TOP_K_OPTIONS = [20, 50, 100]
+# Candidates per page of the Skill Gap Report
+SKILL_GAP_PAGE_SIZE = 20
+# Minimum seconds between live ranking refreshes while resumes stream in
+LIVE_REFRESH_SECONDS = 0.5
+# Extracted job descriptions kept for resubmission, and for how long
+JD_CACHE_MAX_ENTRIES = 1000
+JD_CACHE_TTL_HOURS = 24
+
+
+@st.cache_resource
+def get_extraction_cache():
+    # One on-disk cache per process, shared by every session
+    return ExtractionCache()
+
+
+@st.cache_resource
+def get_jd_cache():
+    # Shared by every session, so a posting pasted twice is extracted once
+    return ExtractionCache(
+        DEFAULT_JD_CACHE_PATH, max_entries=JD_CACHE_MAX_ENTRIES, max_age_days=JD_CACHE_TTL_HOURS / 24
+    )
+
+
+@st.cache_resource
+def get_job_store():
+    # Batches are recorded here as they run, so one cut short by a refresh
+    # or restart can be resumed from any session
+    return JobStore()
+
+
+@st.cache_resource
+def get_candidate_index():
+    # Every analyzed resume is kept here so later JDs can reuse the pool
+    from candidate_index import CandidateIndex
+    return CandidateIndex()
+
+
+def ranking_frame(resumes, must_have=False):
+    # Built column by column; much cheaper than one dict per row
+    import pandas as pd
+    columns = {
+        "Rank": range(1, len(resumes) + 1),
+        "Candidate": [r.name for r in resumes],
+        "Skill Match (%)": [r.skill_match_pct for r in resumes],
+        "Experience Match (%)": [r.exp_score_pct for r in resumes],
+        "Final Score": [r.score for r in resumes],
+        "Matched Skills": [", ".join(r.matched_skills) for r in resumes],
+        "Missing Skills": [", ".join(r.missing_skills) for r in resumes],
+    }
+    if must_have:
+        columns["Missing Must-Haves"] = [", ".join(r.missing_must_have) for r in resumes]
+    if any(r.duplicates for r in resumes):
+        columns["Duplicates"] = [", ".join(r.duplicates) for r in resumes]
+    return pd.DataFrame(columns)
+
+
+def pool_changed():
+    # Call whenever the JD or the candidate pool changes; results_run keys
+    # on this counter, so cached rankings are never shown for another pool
+    st.session_state.pool_version += 1
+
+
+def results_run(system, show):
+    # The ranking and table for the current pool, JD, scoring settings and
+    # page size, computed once and reused by every rerun until one of them
+    # changes. Each new run gets the next run id.
+    key = (st.session_state.pool_version, repr(system.scoring_engine.settings()), show)
+    run = st.session_state.get("results_run")
+    if run is not None and run["key"] == key:
+        return run
+
+    start = time.perf_counter()
+    ranked = system.top_k(len(system.resumes) if show == "All" else show)
+    run = {
+        "id": (run["id"] + 1) if run is not None else 1,
+        "key": key,
+        "ranked": ranked,
+        "df": ranking_frame(ranked),
+        "seconds": time.perf_counter() - start,
+        "csv": None,
+    }
+    st.session_state.results_run = run
+    return run
+
+
+def csv_export(system, run, must_have):
+    # Called by the download button only when it is clicked. The full
+    # ranking is built then, once per run.
+    def build():
+        if run["csv"] is None:
+            ranked = system.top_k(len(system.resumes))
+            run["csv"] = ranking_frame(ranked, must_have).to_csv(index=False)
+        return run["csv"]
+    return build
+
+
+def scoring_controls(system):
+    # Weights, experience cap and must-have skills for the results page.
+    # Only the scoring arithmetic changes, so re-ranking reuses the
+    # extracted data and the cached skill matrix.
+    from fuzzy import DEFAULT_THRESHOLD as FUZZY_THRESHOLD
+    from scoring import EXPERIENCE_CAP, SKILL_WEIGHT
+
+    with st.expander("⚖️ Scoring Settings"):
+        col1, col2 = st.columns(2)
+        skill_weight = col1.slider(
+            "Skill weight (%)", 0, 100, int(SKILL_WEIGHT * 100), step=5, key="score_skill_weight",
+            help="Experience gets the remaining weight"
+        )
+        experience_cap = col2.slider(
+            "Experience cap (% of required years)", 50, 200, EXPERIENCE_CAP, step=10,
+            key="score_experience_cap"
+        )
+        must_have = st.multiselect(
+            "Must-have skills", system.job.skills if system.job else [], key="score_must_have",
+            help="Candidates missing any of these are ranked below the rest"
+        )
+        col1, col2 = st.columns(2)
+        fuzzy = col1.toggle(
+            "Fuzzy skill matching", key="score_fuzzy",
+            help='Also match near-identical names such as "postgres" and "postgresql"'
+        )
+        fuzzy_threshold = col2.slider(
+            "Fuzzy similarity threshold", 0.5, 1.0, FUZZY_THRESHOLD, step=0.05,
+            key="score_fuzzy_threshold", disabled=not fuzzy
+        )
+    system.configure_scoring(
+        skill_weight=skill_weight / 100, experience_weight=(100 - skill_weight) / 100,
+        experience_cap=experience_cap, must_have=must_have,
+        fuzzy=fuzzy, fuzzy_threshold=fuzzy_threshold
+    )
+    return bool(must_have)
+
+
+def show_batch_metrics(metrics):
+    # Where the last batch's time went, its token usage and retries
+    summary = metrics.summary()
+    counters, tokens = summary["counters"], summary["tokens"].get("resume", {})
+    cols = st.columns(5)
+    cols[0].metric("Processed", counters.get("resumes_processed", 0))
+    cols[1].metric("Failed", counters.get("resumes_failed", 0))
+    cols[2].metric("LLM Requests", counters.get("llm_requests", 0))
+    cols[3].metric("Tokens (prompt / completion)", f"{tokens.get('prompt', 0)} / {tokens.get('completion', 0)}")
+    cols[4].metric(
+        "Retries / Fallbacks",
+        f"{counters.get('batch_retries', 0)} / {counters.get('local_fallbacks', 0)}"
+    )
+    rows = metrics.stage_rows()
+    if rows:
+        import pandas as pd
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+
+@st.cache_resource
+def load_css():
+    # Global styles, read once per process rather than on every rerun
+    return "<style>\n" + (STATIC_DIR / "style.css").read_text(encoding="utf-8") + "</style>\n"
+
+
+@st.cache_resource
+def load_logo():
+    # Base64 logo for the hero page, or None when the file is missing
+    logo_path = STATIC_DIR / "image.png"
+    if not logo_path.exists():
+        return None
+    return base64.b64encode(logo_path.read_bytes()).decode()
+
+
+def batch_deadline(count):
+    return RESUME_BATCH_DEADLINE + count * 60 / RESUME_REQUESTS_PER_MINUTE
+
+
+def analyze_resumes(system, items):
+    # Streams items through the pipeline with a progress bar and a live top-k
+    # table, then checks the pool can be scored and reruns. Resumes already
+    # in system.resumes (from a resumed job) count as done.
+    already = len(system.resumes)
+    total = already + len(items)
+    system.batch_deadline = batch_deadline(len(items))
+    progress = st.progress(already / max(total, 1), text=f"Processing {already}/{total} resumes...")
+    live_table = st.empty()
+    last_refresh = 0.0
+
+    # Uploads are parsed straight from memory, no temp files, and
+    # each result is shown as soon as its extraction finishes
+    try:
+        for done, item in enumerate(system.iter_process_resumes(items), start=already + 1):
+            if isinstance(item, ResumeError):
+                st.session_state.resume_errors.append(f"{item.name}: {item.message}")
+                st.error(f"❌ Error processing {item.name}: {item.message}")
+            progress.progress(done / total, text=f"Processing {done}/{total} resumes...")
+
+            # Re-rank the live table at most a few times per second
+            if system.resumes and (done == total or time.monotonic() - last_refresh > LIVE_REFRESH_SECONDS):
+                live_table.dataframe(
+                    ranking_frame(system.top_k(RESULTS_TOP_K_OPTIONS[0]))[
+                        ["Rank", "Candidate", "Skill Match (%)", "Experience Match (%)", "Final Score"]
+                    ],
+                    use_container_width=True,
+                    hide_index=True
+                )
+                last_refresh = time.monotonic()
+    except Exception as e:
+        st.error(f"❌ Error processing resumes: {e}")
+    pool_changed()
+
+    with st.spinner("Scoring..."):
+        try:
+            # Validates the pool; the results page ranks only what it shows
+            system.top_k(RESULTS_TOP_K_OPTIONS[0])
+            st.session_state.resumes_analyzed = True  # <- flag set here
+        except Exception as e:
+            st.error(f"❌ Scoring failed: {e}")
+            st.stop()
+
+    st.success("✅ Resumes processed and scored successfully!")
+    st.rerun()
+
+
+def interrupted_job_banner(system):
+    # Offers the newest interrupted batch from the job store, if any; one
+    # still running in another session holds a lease and is not listed
+    jobs = system.job_store.unfinished_jobs() if system.job_store is not None else []
+    if not jobs or system.job_id is not None:
+        return
+    job = jobs[0]
+    st.info(
+        f"⏸️ An earlier batch was interrupted: {job['done'] + job['failed']} of {job['total']} "
+        f"resumes finished for \"{' '.join(job['jd_text'].split())[:80]}\"."
+    )
+    col1, col2 = st.columns([1, 1])
+    if col1.button("▶️ Resume Batch", key="resume_job_btn"):
+        try:
+            pending = system.resume_job(job["id"])
+        except ValueError as e:
+            # Another session took it over first
+            st.warning(f"⚠️ {e}")
+            return
+        st.session_state.jd_text_saved = system.job.raw_text
+        st.session_state.job_processed = True
+        st.session_state.resume_errors = []
+        st.session_state.current_page = "results"
+        st.session_state.results_viewed = False
+        analyze_resumes(system, pending)
+    if col2.button("🗑️ Discard", key="discard_job_btn"):
+        system.job_store.finish_job(job["id"], status=DISCARDED)
+        st.rerun()
+
+
+def new_system():
+    return ResumeRankingSystem(
+        concurrency=RESUME_CONCURRENCY,
+        requests_per_minute=RESUME_REQUESTS_PER_MINUTE,
+        cache=get_extraction_cache(),
+        batch_token_budget=RESUME_BATCH_TOKEN_BUDGET,
+        compact_prompts=RESUME_COMPACT_PROMPTS,
+        prompt_token_budget=RESUME_PROMPT_TOKEN_BUDGET,
+        request_timeout=RESUME_REQUEST_TIMEOUT,
+        max_retries=RESUME_MAX_RETRIES,
+        hedge_percentile=RESUME_HEDGE_PERCENTILE,
+        candidate_index=get_candidate_index(),
+        job_store=get_job_store()
+    )
+
 st.set_page_config(page_title="KAABIL-LENS", layout="wide", page_icon="🔍")
 
-st.markdown("""
-<style>
-/* GET STARTED BUTTON */
-div[class*="st-key-get_started_btn"] button {
-    background: rgba(255, 255, 255, 0.05) !important;
-    backdrop-filter: blur(10px) !important;
-    color: white !important;
-    padding: 14px 36px !important;
-    font-size: 1.1rem !important;
-    font-weight: 600 !important;
-    border-radius: 12px !important;
-    border: 2px solid #F5A623 !important;
-    transition: all 0.3s ease !important;
-}
-div[class*="st-key-get_started_btn"] button:hover {
-    background: linear-gradient(90deg, #4AA3F0, #F5A623) !important;
-    color: white !important;
-    box-shadow: 0px 0px 15px rgba(245, 166, 35, 0.6) !important;
-    transform: translateY(-2px) !important;
-}
-
-/* ANALYZE JD BUTTON */
-div[class*="st-key-analyze_jd_btn"] button {
-    background: transparent !important;
-    border: 2px solid #4AA3F0 !important;
-    color: #F5A623 !important;
-    padding: 14px 36px !important;
-    font-size: 1.1rem !important;
-    font-weight: 600 !important;
-    border-radius: 12px !important;
-    transition: all 0.3s ease !important;
-}
-div[class*="st-key-analyze_jd_btn"] button:hover {
-    background: transparent !important;
-    box-shadow: 0px 0px 12px rgba(245, 166, 35, 0.7) !important;
-    border-color: #F5A623 !important;
-    color: #F5A623 !important;
-    transform: translateY(-2px) !important;
-}
-/* EDIT JD BUTTON */
-div[class*="st-key-edit_jd_btn"] button {
-    background: transparent !important;
-    border: 2px solid #4AA3F0 !important;
-    color: #4AA3F0 !important;
-    padding: 14px 36px !important;
-    font-size: 1.1rem !important;
-    font-weight: 600 !important;
-    border-radius: 12px !important;
-    transition: all 0.3s ease !important;
-}
-div[class*="st-key-edit_jd_btn"] button:hover {
-    background: transparent !important;
-    box-shadow: 0px 0px 12px rgba(74, 163, 240, 0.7) !important;
-    border-color: #4AA3F0 !important;
-    color: #4AA3F0 !important;
-    transform: translateY(-2px) !important;
-}
-/* Reset button (first button inside sidebar container) */
-section[data-testid="stSidebar"] div.stButton:nth-of-type(1) > button {
-    background: transparent !important;
-    color: #ff4b4b !important;
-    border: 2px solid #ff4b4b !important;
-    backdrop-filter: none !important;
-    font-weight: 600;
-    transition: all 0.3s ease;
-}
-div[class*="st-key-analyze_resumes_btn"] button {
-    background: transparent !important;
-    border: 2px solid #F5A623 !important;
-    color: #4AA3F0 !important;
-    padding: 14px 36px !important;
-    font-size: 1.1rem !important;
-    font-weight: 600 !important;
-    border-radius: 12px !important;
-    transition: all 0.3s ease !important;
-}
-div[class*="st-key-analyze_resumes_btn"] button:hover {
-    background: transparent !important;
-    box-shadow: 0px 0px 12px rgba(74, 163, 240, 0.7) !important;
-    border-color: #F5A623 !important;
-    color: #4AA3F0 !important;
-    transform: translateY(-2px) !important;
-}
-div[class*="st-key-show_results_btn"] button {
-    background: transparent !important;
-    border: 2px solid #4AA3F0 !important;
-    padding: 14px 36px !important;
-    font-size: 1.1rem !important;
-    font-weight: 600 !important;
-    color: #F5A623 !important;
-    border-radius: 12px !important;
-    box-shadow: 0px 0px 10px rgba(74, 163, 240, 0.4) !important;
-    transition: all 0.3s ease !important;
-}
-div[class*="st-key-show_results_btn"] button:hover {
-    background: transparent !important;
-    border-color: #F5A623 !important;
-    box-shadow: 0px 0px 15px rgba(245, 166, 35, 0.6), 0px 0px 10px rgba(74, 163, 240, 0.4) !important;
-    color: white !important;
-    transform: translateY(-2px) !important;
-}
-div[class*="st-key-back_btn"] button {
-    background: transparent !important;
-    border: 2px solid #ff4b4b !important;
-    color: #ff4b4b !important;
-    padding: 14px 36px !important;
-    font-size: 1.1rem !important;
-    font-weight: 600 !important;
-    border-radius: 12px !important;
-    box-shadow: 0px 0px 10px rgba(255, 75, 75, 0.4) !important;
-    transition: all 0.3s ease !important;
-}
-div[class*="st-key-back_btn"] button:hover {
-    background: transparent !important;
-    border-color: #ff4b4b !important;
-    box-shadow: 0px 0px 15px rgba(255, 75, 75, 0.7) !important;
-    color: #ff4b4b !important;
-    transform: translateY(-2px) !important;
-}
-section[data-testid="stSidebar"] div.stButton:nth-of-type(1) > button {
-    background: transparent !important;
-    border: 2px solid #ff4b4b !important;
-    color: #ff4b4b !important;
-    padding: 14px 36px !important;
-    font-size: 1.1rem !important;
-    font-weight: 600 !important;
-    border-radius: 12px !important;
-    box-shadow: 0px 0px 10px rgba(255, 75, 75, 0.4) !important;
-    transition: all 0.3s ease !important;
-}
-section[data-testid="stSidebar"] div.stButton:nth-of-type(1) > button:hover {
-    background: transparent !important;
-    border-color: #ff4b4b !important;
-    box-shadow: 0px 0px 15px rgba(255, 75, 75, 0.7) !important;
-    color: #ff4b4b !important;
-    transform: translateY(-2px) !important;
-}
-div[class*="st-key-download_btn"] button {
-    background: transparent !important;
-    border: 2px solid #00b894 !important;
-    color: #00b894 !important;
-    padding: 14px 36px !important;
-    font-size: 1.1rem !important;
-    font-weight: 600 !important;
-    border-radius: 12px !important;
-    box-shadow: 0px 0px 10px rgba(0, 184, 148, 0.4) !important;
-    transition: all 0.3s ease !important;
-}
-div[class*="st-key-download_btn"] button:hover {
-    background: transparent !important;
-    border-color: #00b894 !important;
-    box-shadow: 0px 0px 15px rgba(0, 184, 148, 0.7) !important;
-    color: #00b894 !important;
-    transform: translateY(-2px) !important;
-}
-/* Hover effect: subtle glow only */
-section[data-testid="stSidebar"] div.stButton:nth-of-type(1) > button:hover {
-    /* Keep background transparent */
-    background: transparent !important;
-    /* Keep text color the same */
-    color: #ff4b4b !important;
-    /* Add subtle glow */
-    box-shadow: 0px 0px 8px rgba(255, 75, 75, 0.5);
-    transform: translateY(-2px); /* tiny lift */
-}
-</style>
-""", unsafe_allow_html=True)
-
-
-# Get the directory where main.py is located
-current_dir = Path(__file__).parent
-# Go up one level to project root, then into static folder
-logo_path = current_dir.parent / "static" / "image.png"
-encoded_logo = None
-if os.path.exists(logo_path):
-    with open(logo_path, "rb") as f:
-        encoded_logo = base64.b64encode(f.read()).decode()
+st.markdown(load_css(), unsafe_allow_html=True)
+
+encoded_logo = load_logo()
 # ---------------------------
 # Session State Initialization
 # ---------------------------
 if "current_page" not in st.session_state:
     st.session_state.current_page = "hero"
 if "system" not in st.session_state:
-    st.session_state.system = ResumeRankingSystem()
+    st.session_state.system = new_system()
+if "pool_version" not in st.session_state:
+    st.session_state.pool_version = 0
 if "job_processed" not in st.session_state:
     st.session_state.job_processed = False
 if "jd_text_saved" not in st.session_state:
@@ -206,6 +329,8 @@ if "uploaded_files" not in st.session_state:
     st.session_state.uploaded_files = []
 if "file_names" not in st.session_state:
     st.session_state.file_names = []
+if "resume_errors" not in st.session_state:
+    st.session_state.resume_errors = []
 # ---------------------------
 # SIDEBAR RESET CONTROL
 # ---------------------------
@@ -303,9 +428,11 @@ with st.sidebar:
         st.session_state.job_processed = False
         st.session_state.jd_text_saved = ""
         st.session_state.resumes_analyzed = False
-        st.session_state.system = ResumeRankingSystem()
+        st.session_state.system = new_system()
+        pool_changed()
         st.session_state.uploaded_files = []  # Add this line
         st.session_state.file_names = []      # Add this line
+        st.session_state.resume_errors = []
         st.rerun()
 
 # ---------------------------
@@ -355,6 +482,8 @@ if st.session_state.current_page == "hero":
 # JOB DESCRIPTION + RESUME PAGE
 # ---------------------------
 elif st.session_state.current_page == "jd_upload":
+    if not st.session_state.job_processed:
+        interrupted_job_banner(st.session_state.system)
 
     # Step 1: Job Description Input
     st.markdown("""
@@ -394,9 +523,14 @@ elif st.session_state.current_page == "jd_upload":
                 if jd_text.strip() == "":
                     st.error("Please enter a job description.")
                 else:
-                    st.session_state.system.job = JobDescription()
+                    st.session_state.system.job = JobDescription(
+                        metrics=st.session_state.system.metrics,
+                        cache=get_jd_cache(),
+                        caller=st.session_state.system.llm
+                    )
                     with st.spinner("Extracting required skills and experience..."):
                         st.session_state.system.job.process_text(jd_text)
+                    pool_changed()
 
                     st.session_state.jd_text_saved = jd_text
                     st.session_state.job_processed = True
@@ -407,6 +541,7 @@ elif st.session_state.current_page == "jd_upload":
             if st.button("Edit Job Description", key="edit_jd_btn"):
                 st.session_state.job_processed = False
                 st.session_state.system.job = None
+                pool_changed()
                 # Don't clear uploaded_files here!
                 st.rerun()
 
@@ -471,6 +606,19 @@ elif st.session_state.current_page == "jd_upload":
             key="resume_uploader"
         )
         
+        # Rank everyone analyzed in earlier runs without re-uploading
+        stored_count = len(get_candidate_index())
+        if stored_count and not st.session_state.resumes_analyzed:
+            if st.button(f"🗂️ Rank {stored_count} Stored Candidates", key="rank_stored_btn"):
+                try:
+                    st.session_state.system.rank_stored_candidates(k=STORED_POOL_TOP_K)
+                    pool_changed()
+                    st.session_state.resumes_analyzed = True
+                except Exception as e:
+                    st.error(f"❌ Ranking stored candidates failed: {e}")
+                    st.stop()
+                st.rerun()
+
         # Update session state when files are uploaded
         if uploaded_files:
             st.session_state.uploaded_files = uploaded_files
@@ -503,34 +651,15 @@ elif st.session_state.current_page == "jd_upload":
             if not st.session_state.resumes_analyzed:
                 if st.button("📊 Analyze Resumes", key="analyze_resumes_btn"):
                     st.session_state.system.resumes = []
-        
-                    with st.spinner("Processing resumes and scoring..."):
-                        for file in st.session_state.uploaded_files:
-                            try:
-                                temp_path = f"temp_{file.name}"
-                                with open(temp_path, "wb") as f_temp:
-                                    f_temp.write(file.getbuffer())
-        
-                                st.session_state.system.process_resumes([temp_path])
-                                os.remove(temp_path)
-                            except Exception as e:
-                                st.error(f"❌ Error processing {file.name}: {e}")
-                                continue
-        
-                        try:
-                            st.session_state.system.calculate_scores()
-                            st.session_state.resumes_analyzed = True  # <- flag set here
-                        except Exception as e:
-                            st.error(f"❌ Scoring failed: {e}")
-                            st.stop()
-        
-                    st.success("✅ Resumes processed and scored successfully!")
-                    st.rerun()
+                    st.session_state.resume_errors = []
+                    analyze_resumes(st.session_state.system, st.session_state.uploaded_files)
 
 # ---------------------------
 # BUTTON TO RESULTS PAGE
 # ---------------------------
     if st.session_state.resumes_analyzed:
+        for message in st.session_state.resume_errors:
+            st.error(f"❌ Error processing {message}")
         st.markdown("<div style='margin-top:40px;'></div>", unsafe_allow_html=True)
         st.markdown("""
         <div style="
@@ -575,18 +704,14 @@ elif st.session_state.current_page == "results":
     if not st.session_state.system.resumes:
         st.warning("No resumes available. Go back and upload resumes first.")
     else:
-        rows = []
-        for i, r in enumerate(st.session_state.system.resumes, start=1):
-            rows.append({
-                "Rank": i,
-                "Candidate": r.name,
-                "Skill Match (%)": r.skill_match_pct,
-                "Experience Match (%)": r.exp_score_pct,
-                "Final Score": r.score,
-                "Matched Skills": ", ".join(r.matched_skills),
-                "Missing Skills": ", ".join(r.missing_skills)
-            })
-        df = pd.DataFrame(rows)
+        # Only the top k are ranked and rendered; the full ranking is built for the CSV
+        total = len(st.session_state.system.resumes)
+        show_options = [n for n in RESULTS_TOP_K_OPTIONS if n < total] + ["All"]
+        show = st.selectbox("Show top candidates", show_options, key="results_top_k")
+        must_have = scoring_controls(st.session_state.system)
+        run = results_run(st.session_state.system, show)
+        ranked, df = run["ranked"], run["df"]
+        st.caption(f"Ranked {total} candidates in {run['seconds'] * 1000:.1f} ms (run {run['id']})")
 
         st.markdown("""
         <div style="
@@ -637,9 +762,21 @@ elif st.session_state.current_page == "results":
             margin-bottom:12px;
         ">Skill Gap Report</div>
         """, unsafe_allow_html=True)
-        
-        for i, r in enumerate(st.session_state.system.resumes, start=1):
-            with st.expander(f"{i}. {r.name}"):
+
+        # One page of expanders at a time, so rendering cost does not grow with the pool
+        pages = max(1, -(-len(ranked) // SKILL_GAP_PAGE_SIZE))
+        page = 1
+        if st.session_state.get("skill_gap_page", 1) > pages:
+            st.session_state.skill_gap_page = 1
+        if pages > 1:
+            page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key="skill_gap_page")
+        first = (page - 1) * SKILL_GAP_PAGE_SIZE
+        if pages > 1:
+            st.caption(f"Candidates {first + 1}–{min(first + SKILL_GAP_PAGE_SIZE, len(ranked))} of {len(ranked)}")
+
+        for i, r in enumerate(ranked[first:first + SKILL_GAP_PAGE_SIZE], start=first + 1):
+            flag = " ⚠️ missing must-haves" if r.missing_must_have else ""
+            with st.expander(f"{i}. {r.name}{flag}"):
                 matched = r.matched_skills if r.matched_skills else []
                 missing = r.missing_skills if r.missing_skills else []
         
@@ -666,8 +803,14 @@ elif st.session_state.current_page == "results":
                     + missing_bullets,
                     unsafe_allow_html=True
                 )
+                if r.missing_must_have:
+                    st.warning("Missing must-have skills: " + ", ".join(r.missing_must_have))
+                if r.duplicates:
+                    st.caption("♻️ Also uploaded as: " + ", ".join(r.duplicates))
+
+        with st.expander("⏱️ Batch Metrics"):
+            show_batch_metrics(st.session_state.system.batch_metrics)
 
-        csv = df.to_csv(index=False)
         col1, col2 = st.columns([1.85, 1])
         with col1:
             if st.button("⬅️ Back to Job/Resume Page", key="back_btn"):
@@ -678,7 +821,7 @@ elif st.session_state.current_page == "results":
         with col2:
             if st.download_button(
                 label="📥 Download CSV of Ranked Candidates",
-                data=csv,
+                data=csv_export(st.session_state.system, run, must_have),
                 file_name="ranked_candidates.csv",
                 mime="text/csv",
                 key="download_btn"
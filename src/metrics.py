@@ -0,0 +1,147 @@
+# metrics.py
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+METRIC_PREFIX = "resume_ranking"
+# Recent durations kept per stage for percentiles
+SAMPLE_WINDOW = 2048
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Metrics:
+    # Thread-safe per-stage timings, LLM token counts and event counters.
+    # A Metrics created with a parent forwards everything it records to the
+    # parent too, so a per-batch instance also feeds the running totals.
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.started = time.time()
+        self.stages = {}
+        self.tokens = {}
+        self.counters = {}
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            entry = self.stages.setdefault(stage, {"count": 0, "seconds": 0.0, "max": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+            self._samples.setdefault(stage, deque(maxlen=SAMPLE_WINDOW)).append(seconds)
+        if self.parent is not None:
+            self.parent.record(stage, seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def add_tokens(self, source, usage):
+        # usage is the `usage` object of a Groq chat completion
+        if usage is None:
+            return
+        prompt = getattr(usage, "prompt_tokens", 0) or 0
+        completion = getattr(usage, "completion_tokens", 0) or 0
+        with self._lock:
+            entry = self.tokens.setdefault(source, {"prompt": 0, "completion": 0})
+            entry["prompt"] += prompt
+            entry["completion"] += completion
+        if self.parent is not None:
+            self.parent.add_tokens(source, usage)
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+        if self.parent is not None:
+            self.parent.incr(name, amount)
+
+    def percentile(self, stage, q):
+        # q in [0, 1] over the last SAMPLE_WINDOW durations, or None
+        with self._lock:
+            samples = sorted(self._samples.get(stage, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def summary(self):
+        with self._lock:
+            stages = {name: dict(entry) for name, entry in self.stages.items()}
+        for name, entry in stages.items():
+            entry.update({f"p{round(q * 100)}": self.percentile(name, q) for q in QUANTILES})
+        with self._lock:
+            return {
+                "started": self.started,
+                "elapsed_seconds": time.time() - self.started,
+                "stages": stages,
+                "tokens": {name: dict(entry) for name, entry in self.tokens.items()},
+                "counters": dict(self.counters),
+            }
+
+    def stage_rows(self):
+        # One row per stage for tables, slowest total first
+        rows = []
+        for stage, entry in sorted(self.summary()["stages"].items(), key=lambda item: -item[1]["seconds"]):
+            rows.append({
+                "Stage": stage,
+                "Calls": entry["count"],
+                "Total (s)": round(entry["seconds"], 3),
+                "Mean (ms)": round(entry["seconds"] / entry["count"] * 1000, 1),
+                "p95 (ms)": round(entry["p95"] * 1000, 1),
+                "Max (ms)": round(entry["max"] * 1000, 1),
+            })
+        return rows
+
+    def write_json_log(self, path, **extra):
+        # Appends one JSON line per call (e.g. per batch)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"time": time.time(), **extra, **self.summary()}) + "\n")
+
+    def prometheus_text(self):
+        summary = self.summary()
+        lines = [
+            f"# HELP {METRIC_PREFIX}_stage_seconds Time spent in each pipeline stage.",
+            f"# TYPE {METRIC_PREFIX}_stage_seconds summary",
+        ]
+        for stage, entry in summary["stages"].items():
+            for q in QUANTILES:
+                value = entry[f"p{round(q * 100)}"]
+                lines.append(f'{METRIC_PREFIX}_stage_seconds{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_sum{{stage="{stage}"}} {entry["seconds"]:.6f}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_count{{stage="{stage}"}} {entry["count"]}')
+
+        lines += [
+            f"# HELP {METRIC_PREFIX}_stage_seconds_max Slowest single call of each pipeline stage.",
+            f"# TYPE {METRIC_PREFIX}_stage_seconds_max gauge",
+        ]
+        for stage, entry in summary["stages"].items():
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_max{{stage="{stage}"}} {entry["max"]:.6f}')
+
+        lines += [
+            f"# HELP {METRIC_PREFIX}_llm_tokens_total LLM tokens used, from the API usage field.",
+            f"# TYPE {METRIC_PREFIX}_llm_tokens_total counter",
+        ]
+        for source, entry in summary["tokens"].items():
+            for kind in ("prompt", "completion"):
+                lines.append(f'{METRIC_PREFIX}_llm_tokens_total{{source="{source}",kind="{kind}"}} {entry[kind]}')
+
+        lines += [
+            f"# HELP {METRIC_PREFIX}_events_total Pipeline events such as retries, errors and cache hits.",
+            f"# TYPE {METRIC_PREFIX}_events_total counter",
+        ]
+        for name, value in summary["counters"].items():
+            lines.append(f'{METRIC_PREFIX}_events_total{{event="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        # Written whole and renamed, for node_exporter's textfile collector
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
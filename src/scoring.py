@@ -0,0 +1,509 @@
+# scoring.py
+import numpy as np
+
+from fuzzy import DEFAULT_THRESHOLD, get_matcher
+
+SKILL_WEIGHT = 0.7
+EXPERIENCE_WEIGHT = 0.3
+# Highest experience score, in % of the required years
+EXPERIENCE_CAP = 100
+# Candidate rows per block in the multi-job matrix product (score_jobs)
+JOB_BLOCK_ROWS = 8192
+
+
+def round1(values):
+    # Vectorized round(x, 1) that matches Python's round() exactly. x * 10 is
+    # formed as x * 8 + x * 2 with an error-free sum, so when the product
+    # lands on a .5 boundary the sign of the rounding error tells which side
+    # the true value is on; exact halves go to even, as round() does.
+    values = np.asarray(values, dtype=np.float64)
+    high, low = values * 8, values * 2
+    scaled = high + low
+    low_part = scaled - high
+    error = (high - (scaled - low_part)) + (low - low_part)
+
+    floor = np.floor(scaled)
+    rounded = np.rint(scaled)
+    half = scaled - floor == 0.5
+    rounded[half & (error > 0)] = floor[half & (error > 0)] + 1
+    rounded[half & (error < 0)] = floor[half & (error < 0)]
+    return rounded / 10
+
+
+def prune_for_top_k(final_raw, k, group=None):
+    # Rounding moves a score by at most 0.05, so anything more than 0.1 below
+    # the k-th best unrounded score can never make the top k. Returns the
+    # indices still in the running, so only those need rounding and sorting.
+    # Candidates with group=True rank above all others (see rank_order).
+    n = len(final_raw)
+    if k is None or k >= n:
+        return np.arange(n)
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if group is not None:
+        # Lifts the first group clear of the rest without reordering either
+        final_raw = final_raw + group * (np.ptp(final_raw) + 1)
+    kth = np.partition(final_raw, n - k)[n - k]
+    return np.flatnonzero(final_raw >= kth - 0.1)
+
+
+def rank_order(score, skill_pct, exp_pct, k=None, tiebreak=None, group=None):
+    # Indices of the best k entries by (score, skill match, experience),
+    # descending; remaining ties go to the lower tiebreak value (default:
+    # position). Entries with group=True (e.g. having every must-have
+    # skill) come before all others. Uses partitioning so the cost grows
+    # with k, not the pool.
+    n = len(score)
+    if k is not None and k <= 0:
+        return np.zeros(0, dtype=np.int64)
+
+    lifted = score if group is None else score + group * (np.ptp(score) + 1)
+    candidates = np.arange(n)
+    if k is not None and k < n:
+        kth = np.partition(lifted, n - k)[n - k]
+        candidates = np.flatnonzero(lifted >= kth)
+
+    tiebreak = candidates if tiebreak is None else np.asarray(tiebreak)[candidates]
+    keys = [tiebreak, -exp_pct[candidates], -skill_pct[candidates], -score[candidates]]
+    if group is not None:
+        keys.append(~group[candidates])
+    order = np.lexsort(keys)
+    selected = candidates[order]
+    return selected if k is None else selected[:k]
+
+
+class CandidateMatrix:
+    # Candidate skills as a sparse boolean matrix over interned skill IDs,
+    # stored as parallel (row, skill id) arrays with one entry per unique
+    # skill a candidate has. Built once per pool and reused across rescoring.
+    def __init__(self, resumes, engine):
+        self.resumes = list(resumes)
+        self.row_of = {id(resume): row for row, resume in enumerate(self.resumes)}
+
+        rows, indices = [], []
+        for row, resume in enumerate(self.resumes):
+            ids = {engine.intern(skill) for skill in resume.skills}
+            indices.extend(ids)
+            rows.extend([row] * len(ids))
+
+        self.rows = np.array(rows, dtype=np.int64)
+        self.indices = np.array(indices, dtype=np.int64)
+        self.experience = np.array([float(r.experience) for r in self.resumes], dtype=np.float64)
+
+
+class ScoreResult:
+    def __init__(self, order, skill_match_pct, exp_score_pct, score, matched, missing, missing_must_have=None):
+        # order[i] is the index (into the scored list) of the i-th ranked candidate
+        self.order = order
+        self.skill_match_pct = skill_match_pct
+        self.exp_score_pct = exp_score_pct
+        self.score = score
+        self.matched = matched
+        self.missing = missing
+        # Per candidate, the must-have skills it lacks (empty when none are set)
+        self.missing_must_have = missing_must_have or [[] for _ in score]
+
+
+class MultiScoreResult:
+    # Every candidate (rows, in the caller's order) scored against every job
+    # (columns). rankings[j] indexes the best candidates for job j, best
+    # first; best_fit[i] indexes the jobs candidate i fits best. Scores are
+    # kept unrounded; values() rounds just the pairs asked for.
+    def __init__(self, skill_raw, exp_raw, final_raw, capped, required, rankings, best_fit,
+                 missing_must_have=None, experience_cap=EXPERIENCE_CAP):
+        self.skill_raw = skill_raw
+        self.exp_raw = exp_raw
+        self.final_raw = final_raw
+        self.capped = capped
+        self.required = required
+        self.rankings = rankings
+        self.best_fit = best_fit
+        # Per candidate, the must-have skills it lacks (None when none are set)
+        self.missing_must_have = missing_must_have
+        self.experience_cap = experience_cap
+
+    def values(self, rows, cols):
+        # (skill match, experience score, final score) lists for the
+        # (candidate, job) pairs, as the same Python numbers top_k gives
+        rows, cols = np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+        skill_list, exp_list = ScoringEngine._python_numbers(
+            round1(self.skill_raw[rows, cols]), round1(self.exp_raw[rows, cols]), self.capped[rows, cols],
+            True, self.experience_cap
+        )
+        for i, j in enumerate(cols.tolist()):
+            if not self.required[j]:
+                skill_list[i] = 0
+        return skill_list, exp_list, round1(self.final_raw[rows, cols]).tolist()
+
+
+class ScoringEngine:
+    # Vectorized equivalent of the original per-resume scoring loop. Scores,
+    # rounding and the (score, skill match, experience) tie-break order match
+    # the pure Python version exactly with the default settings.
+    #
+    # Weights, the experience cap and must-have skills are plain attributes
+    # (see configure); changing them only changes the arithmetic, so the
+    # cached candidate matrix is reused and re-ranking stays cheap.
+    # Candidates lacking a must-have skill rank below all that have them.
+    #
+    # With fuzzy=True a JD skill also matches candidate skills whose
+    # character n-gram vectors (fuzzy.py) are at least fuzzy_threshold
+    # similar, and matched lists show the pair, e.g. "postgresql (≈ postgres)".
+    def __init__(self, skill_weight=SKILL_WEIGHT, experience_weight=EXPERIENCE_WEIGHT,
+                 experience_cap=EXPERIENCE_CAP, must_have=(), fuzzy=False,
+                 fuzzy_threshold=DEFAULT_THRESHOLD):
+        self.skill_weight = skill_weight
+        self.experience_weight = experience_weight
+        self.experience_cap = experience_cap
+        self.must_have = list(dict.fromkeys(must_have))
+        self.fuzzy = fuzzy
+        self.fuzzy_threshold = fuzzy_threshold
+        self.skill_ids = {}
+        self.skill_names = []
+        # (skills, fuzzy, threshold) -> matches against the current matrix
+        self._match_cache = {}
+        self._matrix = None
+        self._last_resumes = None
+        self._last_rows = None
+
+    def configure(self, skill_weight=None, experience_weight=None, experience_cap=None, must_have=None,
+                  fuzzy=None, fuzzy_threshold=None):
+        if skill_weight is not None:
+            self.skill_weight = skill_weight
+        if experience_weight is not None:
+            self.experience_weight = experience_weight
+        if experience_cap is not None:
+            self.experience_cap = experience_cap
+        if must_have is not None:
+            self.must_have = list(dict.fromkeys(must_have))
+        if fuzzy is not None:
+            self.fuzzy = fuzzy
+        if fuzzy_threshold is not None:
+            self.fuzzy_threshold = fuzzy_threshold
+
+    def settings(self):
+        return {
+            "skill_weight": self.skill_weight,
+            "experience_weight": self.experience_weight,
+            "experience_cap": self.experience_cap,
+            "must_have": list(self.must_have),
+            "fuzzy": self.fuzzy,
+            "fuzzy_threshold": self.fuzzy_threshold,
+        }
+
+    def intern(self, skill):
+        skill_id = self.skill_ids.get(skill)
+        if skill_id is None:
+            skill_id = len(self.skill_names)
+            self.skill_ids[skill] = skill_id
+            self.skill_names.append(skill)
+        return skill_id
+
+    def matrix_for(self, resumes):
+        # Returns the cached matrix plus the row of each resume in the
+        # caller's current order; the matrix is rebuilt when the pool changes.
+        matrix = self._matrix
+        # Same list in the same order as last time: a C-level identity compare
+        if matrix is not None and resumes == self._last_resumes:
+            return matrix, self._last_rows
+
+        rows = None
+        if matrix is not None and len(resumes) == len(matrix.resumes):
+            try:
+                rows = np.fromiter((matrix.row_of[id(r)] for r in resumes), dtype=np.int64, count=len(resumes))
+            except KeyError:
+                pass
+
+        if rows is None:
+            self._matrix = CandidateMatrix(resumes, self)
+            self._match_cache = {}
+            rows = np.arange(len(resumes), dtype=np.int64)
+
+        self._last_resumes, self._last_rows = list(resumes), rows
+        return self._matrix, rows
+
+    def score(self, resumes, required_skills, required_experience):
+        # Rows in the caller's current order, so ties keep that order like list.sort
+        matrix, perm = self.matrix_for(resumes)
+        required = list(dict.fromkeys(required_skills))
+        matches, skill_raw, exp_raw, final_raw, capped = self._score_arrays(
+            matrix, perm, required, required_experience
+        )
+        group = self._must_have_group(matrix, perm)
+        skill_pct, exp_pct, score = round1(skill_raw), round1(exp_raw), round1(final_raw)
+        order = rank_order(score, skill_pct, exp_pct, group=group)
+
+        skill_list, exp_list = self._python_numbers(skill_pct, exp_pct, capped, required, self.experience_cap)
+        matched, missing = self._skill_lists(matrix, perm, matches, required)
+        return ScoreResult(
+            order, skill_list, exp_list, score.tolist(), matched, missing,
+            self._must_have_lists(matrix, perm, group)
+        )
+
+    def top_k(self, resumes, required_skills, required_experience, k, min_score=None):
+        # Same ranking as score() restricted to the best k candidates (and,
+        # optionally, to scores >= min_score). Everything after the vectorized
+        # arithmetic - rounding, sorting, skill lists - only touches the few
+        # candidates that can still make the cut. order indexes `resumes`.
+        matrix, perm = self.matrix_for(resumes)
+        required = list(dict.fromkeys(required_skills))
+        matches, skill_raw, exp_raw, final_raw, capped = self._score_arrays(
+            matrix, perm, required, required_experience
+        )
+
+        group = self._must_have_group(matrix, perm)
+
+        keep = np.arange(len(resumes))
+        if min_score is not None:
+            # Rounding moves a score by at most 0.05
+            keep = np.flatnonzero(final_raw >= min_score - 0.05)
+        keep = keep[prune_for_top_k(final_raw[keep], k, None if group is None else group[keep])]
+
+        skill_pct, exp_pct, score = round1(skill_raw[keep]), round1(exp_raw[keep]), round1(final_raw[keep])
+        if min_score is not None:
+            above = score >= min_score
+            keep, skill_pct, exp_pct, score = keep[above], skill_pct[above], exp_pct[above], score[above]
+
+        selected = rank_order(score, skill_pct, exp_pct, k=k, group=None if group is None else group[keep])
+        keep = keep[selected]
+
+        skill_list, exp_list = self._python_numbers(
+            skill_pct[selected], exp_pct[selected], capped[keep], required, self.experience_cap
+        )
+        matched, missing = self._skill_lists(matrix, perm[keep], matches, required)
+        return ScoreResult(
+            keep, skill_list, exp_list, score[selected].tolist(), matched, missing,
+            self._must_have_lists(matrix, perm[keep], None if group is None else group[keep])
+        )
+
+    def score_jobs(self, resumes, jobs, k=None, best=1):
+        # Scores every candidate against every job in one pass; jobs is a
+        # list of (required skills, required years). The skill overlap of the
+        # whole grid is the candidates' skill matrix times the transposed
+        # job skill matrix, restricted to skills some job asks for and done
+        # in row blocks to bound memory. Each job's ranking matches what
+        # top_k gives for it alone; matching is exact (fuzzy is ignored) and
+        # must-have skills apply to every job.
+        matrix, perm = self.matrix_for(resumes)
+        required = [list(dict.fromkeys(skills)) for skills, _ in jobs]
+        n, m = len(perm), len(jobs)
+
+        # Job skill matrix over the columns any job uses
+        column = np.full(len(self.skill_names), -1, dtype=np.int64)
+        columns, job_rows, job_cols = {}, [], []
+        for j, skills in enumerate(required):
+            for skill in skills:
+                skill_id = self.skill_ids.get(skill)
+                if skill_id is None:
+                    continue
+                col = columns.setdefault(skill_id, len(columns))
+                column[skill_id] = col
+                job_rows.append(j)
+                job_cols.append(col)
+        width = max(1, len(columns))
+        job_matrix = np.zeros((m, width), dtype=np.float32)
+        job_matrix[job_rows, job_cols] = 1
+
+        # Candidate entries on those columns; matrix rows are in ascending order
+        entry_col = column[matrix.indices]
+        hits = entry_col >= 0
+        hit_rows, hit_cols = matrix.rows[hits], entry_col[hits]
+        counts = np.zeros((len(matrix.resumes), m), dtype=np.float32)
+        for start in range(0, len(matrix.resumes), JOB_BLOCK_ROWS):
+            stop = min(start + JOB_BLOCK_ROWS, len(matrix.resumes))
+            lo, hi = np.searchsorted(hit_rows, [start, stop])
+            block = np.zeros((stop - start, width), dtype=np.float32)
+            block[hit_rows[lo:hi] - start, hit_cols[lo:hi]] = 1
+            counts[start:stop] = block @ job_matrix.T
+        counts = counts[perm].astype(np.float64)
+
+        lengths = np.array([len(skills) for skills in required], dtype=np.float64)
+        skill_raw = np.divide(counts, lengths, out=np.zeros((n, m)), where=lengths > 0) * 100
+
+        years = np.array([float(years) for _, years in jobs], dtype=np.float64)
+        experience = matrix.experience[perm][:, None]
+        exp_uncapped = np.divide(experience, years, out=np.zeros((n, m)), where=years > 0) * 100
+        exp_raw = np.minimum(exp_uncapped, self.experience_cap)
+        capped = (exp_uncapped > self.experience_cap) & (years > 0)
+        final_raw = skill_raw * self.skill_weight + exp_raw * self.experience_weight
+
+        group = self._must_have_group(matrix, perm)
+
+        # Same pruning and tie-breaks as top_k, one job at a time; only
+        # candidates that can still make a job's top k are rounded
+        rankings = []
+        for j in range(m):
+            keep = prune_for_top_k(final_raw[:, j], k, group)
+            selected = rank_order(
+                round1(final_raw[keep, j]), round1(skill_raw[keep, j]), round1(exp_raw[keep, j]), k=k,
+                group=None if group is None else group[keep]
+            )
+            rankings.append(keep[selected])
+
+        return MultiScoreResult(
+            skill_raw, exp_raw, final_raw, capped, required, rankings,
+            self._best_fit(skill_raw, exp_raw, final_raw, best),
+            self._must_have_lists(matrix, perm, group), self.experience_cap
+        )
+
+    @staticmethod
+    def _best_fit(skill_raw, exp_raw, final_raw, best):
+        # Each candidate's best jobs by (score, skill match, experience),
+        # then job order. As in prune_for_top_k, only jobs within 0.1 of a
+        # candidate's best-th unrounded score are rounded and sorted.
+        n, m = final_raw.shape
+        best = max(0, min(best, m))
+        if not best:
+            return np.zeros((n, 0), dtype=np.int64)
+        kth = np.partition(final_raw, m - best, axis=1)[:, m - best]
+        rows, cols = np.nonzero(final_raw >= kth[:, None] - 0.1)
+
+        score = round1(final_raw[rows, cols])
+        skill_pct, exp_pct = round1(skill_raw[rows, cols]), round1(exp_raw[rows, cols])
+        order = np.lexsort((cols, -exp_pct, -skill_pct, -score, rows))
+
+        # Every row keeps at least `best` entries; take the first `best` of each
+        per_row = np.bincount(rows, minlength=n)
+        within = np.arange(len(order)) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+        return cols[order][within < best].reshape(n, best)
+
+    @staticmethod
+    def _python_numbers(skill_pct, exp_pct, capped, required, cap=EXPERIENCE_CAP):
+        # Plain Python numbers for the Resume fields. The old loop produced
+        # the int 0 with no required skills and the int 100 when min(x, 100)
+        # capped the experience score, so those are kept as they were.
+        skill_list = skill_pct.tolist() if required else [0] * len(skill_pct)
+        exp_list = exp_pct.tolist()
+        for i in np.flatnonzero(capped).tolist():
+            exp_list[i] = cap
+        return skill_list, exp_list
+
+    def _must_have_group(self, matrix, perm):
+        # True for candidates having every must-have skill, or None when no
+        # must-have skills are set
+        if not self.must_have:
+            return None
+        rows, _, _ = self._matches(matrix, self.must_have)
+        counts = np.bincount(rows, minlength=len(matrix.resumes))[perm]
+        return counts == len(self.must_have)
+
+    def _must_have_lists(self, matrix, perm, group):
+        if group is None:
+            return None
+        rows, rank, _ = self._matches(matrix, self.must_have)
+        have = np.zeros((len(matrix.resumes), len(self.must_have)), dtype=bool)
+        have[rows, rank] = True
+        lists = [[] for _ in range(len(perm))]
+        for i in np.flatnonzero(~group).tolist():
+            lists[i] = [s for s, found in zip(self.must_have, have[perm[i]].tolist()) if not found]
+        return lists
+
+    def _matches(self, matrix, skills):
+        # Which of `skills` each candidate has, as parallel arrays with one
+        # entry per (matrix row, index into skills) pair: the row, the index
+        # and the id of the candidate skill that matched it. Kept until the
+        # matrix changes, so re-ranking with new weights skips this step.
+        key = (tuple(skills), self.fuzzy, self.fuzzy_threshold if self.fuzzy else None)
+        cached = self._match_cache.get(key)
+        if cached is None:
+            if len(self._match_cache) >= 16:
+                self._match_cache.clear()
+            find = self._fuzzy_matches if self.fuzzy else self._exact_matches
+            cached = self._match_cache[key] = find(matrix, skills)
+        return cached
+
+    def _exact_matches(self, matrix, skills):
+        rank = np.full(len(self.skill_names), -1, dtype=np.int64)
+        for i, skill in enumerate(skills):
+            if skill in self.skill_ids:
+                rank[self.skill_ids[skill]] = i
+        entry_rank = rank[matrix.indices]
+        hits = entry_rank >= 0
+        return matrix.rows[hits], entry_rank[hits], matrix.indices[hits]
+
+    def _fuzzy_matches(self, matrix, skills):
+        # Similar (skill, candidate skill id) pairs come from the n-gram
+        # vectors of the unique skill names only; they are then expanded
+        # over the matrix entries, keeping each candidate's most similar
+        # skill per JD skill.
+        query, skill_id, sim = get_matcher().similar(skills, self.skill_names, self.fuzzy_threshold)
+        order = np.argsort(skill_id, kind="stable")
+        query, skill_id, sim = query[order], skill_id[order], sim[order]
+        per_skill = np.bincount(skill_id, minlength=len(self.skill_names))
+        first = np.concatenate(([0], np.cumsum(per_skill)[:-1]))
+
+        counts = per_skill[matrix.indices]
+        entry = np.repeat(np.arange(len(matrix.indices)), counts)
+        within = np.arange(len(entry)) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair = first[matrix.indices[entry]] + within
+
+        rows, rank, via = matrix.rows[entry], query[pair], matrix.indices[entry]
+        best = np.lexsort((-sim[pair], rows * max(1, len(skills)) + rank))
+        slot = (rows * max(1, len(skills)) + rank)[best]
+        best = best[np.concatenate(([True], slot[1:] != slot[:-1]))] if len(best) else best
+        return rows[best], rank[best], via[best]
+
+    def _score_arrays(self, matrix, perm, required, required_experience):
+        matches = self._matches(matrix, required)
+        matched_counts = np.bincount(matches[0], minlength=len(matrix.resumes))[perm]
+
+        if required:
+            skill_raw = matched_counts / len(required) * 100
+        else:
+            skill_raw = np.zeros(len(perm))
+
+        if required_experience > 0:
+            exp_uncapped = matrix.experience[perm] / required_experience * 100
+            exp_raw = np.minimum(exp_uncapped, self.experience_cap)
+            capped = exp_uncapped > self.experience_cap
+        else:
+            exp_raw = np.zeros(len(perm))
+            capped = np.zeros(len(perm), dtype=bool)
+
+        final_raw = skill_raw * self.skill_weight + exp_raw * self.experience_weight
+        return matches, skill_raw, exp_raw, final_raw, capped
+
+    def _skill_lists(self, matrix, perm, matches, required):
+        # Each candidate's matched set is packed into bit masks over the
+        # required skills (62 skills per int64 column). Candidates with the
+        # same mask share one lookup, and both lists follow the JD's order.
+        rows, rank, via = matches
+
+        # Only rows listed in perm get a mask, so top_k pays for k rows
+        position = np.full(len(matrix.resumes), -1, dtype=np.int64)
+        position[perm] = np.arange(len(perm))
+        hit_position = position[rows]
+        wanted = hit_position >= 0
+        hit_position = hit_position[wanted]
+        hit_rank = rank[wanted]
+
+        masks = np.zeros((len(perm), max(1, -(-len(required) // 62))), dtype=np.int64)
+        np.add.at(masks, (hit_position, hit_rank // 62), np.left_shift(1, hit_rank % 62))
+
+        keys = masks[:, 0].tolist() if masks.shape[1] == 1 else map(tuple, masks.tolist())
+
+        lookup = {}
+        matched, missing = [], []
+        for key in keys:
+            lists = lookup.get(key)
+            if lists is None:
+                words = key if isinstance(key, tuple) else (key,)
+                found = [(words[i // 62] >> (i % 62)) & 1 for i in range(len(required))]
+                lists = lookup[key] = (
+                    [s for s, bit in zip(required, found) if bit],
+                    [s for s, bit in zip(required, found) if not bit],
+                )
+            matched.append(list(lists[0]))
+            missing.append(list(lists[1]))
+
+        if self.fuzzy:
+            # Name the candidate skill behind every match that was not exact
+            hit_via = via[wanted]
+            required_ids = np.array([self.skill_ids.get(s, -1) for s in required] or [-1], dtype=np.int64)
+            labels = {}
+            for i in np.flatnonzero(hit_via != required_ids[hit_rank]).tolist():
+                skill = required[hit_rank[i]]
+                labels.setdefault(hit_position[i], {})[skill] = f"{skill} (≈ {self.skill_names[hit_via[i]]})"
+            for i, names in labels.items():
+                matched[i] = [names.get(s, s) for s in matched[i]]
+        return matched, missing
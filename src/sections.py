@@ -0,0 +1,139 @@
+# sections.py
+import re
+
+# Heading wording -> section. Matched against whole lines (case-insensitive,
+# ignoring bullets and a trailing colon), or a line that starts with the
+# heading followed by ":" such as "Skills: Python, Docker".
+SECTION_HEADINGS = {
+    "summary": [
+        "summary", "professional summary", "career summary", "profile", "professional profile",
+        "about me", "objective", "career objective", "overview",
+    ],
+    "skills": [
+        "skills", "technical skills", "key skills", "core skills", "core competencies",
+        "competencies", "technologies", "tech stack", "tools", "tools and technologies",
+        "skills and tools", "technical expertise", "expertise", "areas of expertise",
+        "programming languages", "frameworks",
+    ],
+    "experience": [
+        "experience", "professional experience", "work experience", "relevant experience",
+        "employment", "employment history", "work history", "career history", "internships",
+        "internship", "professional background",
+    ],
+    "projects": [
+        "projects", "personal projects", "academic projects", "key projects", "selected projects",
+        "side projects", "open source",
+    ],
+    "certifications": [
+        "certifications", "certificates", "licenses", "licenses and certifications",
+        "courses", "training",
+    ],
+    "education": ["education", "academic background", "qualifications", "academics"],
+    "other": [
+        "references", "referees", "hobbies", "interests", "hobbies and interests",
+        "personal details", "personal information", "contact", "contact information",
+        "awards", "achievements", "honors", "publications", "volunteering",
+        "volunteer experience", "extracurricular activities", "declaration",
+    ],
+}
+
+# Sections that carry skills or years of experience, most important first;
+# when the token budget is tight the tail of this list is cut first.
+KEEP_SECTIONS = ("skills", "experience", "summary", "projects", "certifications")
+
+# Truncated sections shorter than this are dropped instead
+MIN_FRAGMENT_TOKENS = 16
+
+_HEADING_LOOKUP = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+_HEADING_PREFIX = re.compile(
+    r"^(" + "|".join(sorted(map(re.escape, _HEADING_LOOKUP), key=len, reverse=True)) + r")\s*:\s*(.*)$",
+    re.IGNORECASE
+)
+_BULLET = re.compile(r"^[\s•·▪●◦\-–—*>|]+")
+_PAGE_NUMBER = re.compile(r"^(page\s*)?\d+(\s*(of|/)\s*\d+)?$", re.IGNORECASE)
+
+
+def estimate_tokens(text):
+    # Rough local estimate (~4 characters per token) used for batch packing
+    # and the prompt budget
+    return len(text) // 4 + 1
+
+
+def _heading(line):
+    # Returns (section, rest of line) when the line is a section heading
+    bare = _BULLET.sub("", line).strip().rstrip(":").strip().lower().replace("&", "and")
+    section = _HEADING_LOOKUP.get(bare)
+    if section is not None:
+        return section, ""
+
+    match = _HEADING_PREFIX.match(_BULLET.sub("", line).strip())
+    if match:
+        return _HEADING_LOOKUP[match.group(1).lower()], match.group(2)
+    return None
+
+
+def segment_resume(text):
+    # Splits line-structured resume text into [(section, text)] in document
+    # order. Lines before the first heading (name, contact details) are
+    # the "header" section.
+    sections = [["header", []]]
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or _PAGE_NUMBER.match(line):
+            continue
+        heading = _heading(line)
+        if heading is not None:
+            section, rest = heading
+            sections.append([section, [rest] if rest else []])
+        else:
+            sections[-1][1].append(line)
+
+    return [(section, " ".join(" ".join(lines).split())) for section, lines in sections if lines]
+
+
+def _truncate(text, tokens):
+    # Cuts at a word boundary so the estimate stays within `tokens`
+    limit = max(0, (tokens - 1) * 4)
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit + 1)
+    return text[:cut if cut > 0 else limit]
+
+
+def compact_resume(text, token_budget=None, keep=KEEP_SECTIONS):
+    # Keeps only the sections in `keep` and fits them into token_budget,
+    # dropping lower-priority sections first. Falls back to the whole text
+    # when no relevant heading is found, so unusual layouts lose nothing.
+    # Returns (compacted text, report dict).
+    segments = segment_resume(text)
+    full = " ".join(body for _, body in segments)
+    kept = [(i, section, body) for i, (section, body) in enumerate(segments) if section in keep]
+    if not kept:
+        kept = [(0, "full", full)]
+
+    priority = {section: rank for rank, section in enumerate(keep)}
+    kept.sort(key=lambda entry: (priority.get(entry[1], len(keep)), entry[0]))
+
+    chosen, remaining = [], token_budget
+    for index, section, body in kept:
+        if remaining is not None:
+            cut = _truncate(body, remaining)
+            # A few words cut from a section only add noise
+            if len(cut) < len(body) and estimate_tokens(cut) < MIN_FRAGMENT_TOKENS:
+                break
+            body = cut
+            remaining -= estimate_tokens(body)
+        if body:
+            chosen.append((index, section, body))
+    chosen.sort()
+
+    compacted = " ".join(body for _, _, body in chosen)
+    report = {
+        "sections_found": [section for section, _ in segments],
+        "sections_kept": [section for _, section, _ in chosen],
+        "tokens_before": estimate_tokens(full),
+        "tokens_after": estimate_tokens(compacted),
+    }
+    return compacted, report
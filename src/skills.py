@@ -0,0 +1,233 @@
+# skills.py
+import os
+import re
+from functools import lru_cache
+
+CANONICAL_MAP = {
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "react js": "react",
+    "reactjs": "react",
+    "node js": "nodejs",
+    "js": "javascript",
+    "py": "python"
+}
+
+# Skills the local extractor looks for. Words that are also common English
+# ("go", "r", "c", "rest", "spring") are left out on purpose; the LLM handles those.
+SKILL_VOCABULARY = [
+    # Languages
+    "python", "java", "javascript", "typescript", "c++", "c#", "golang", "rust",
+    "kotlin", "swift", "scala", "ruby", "php", "perl", "matlab", "bash", "shell scripting",
+    "sql", "nosql", "html", "css", "sass", "dart", "haskell", "elixir", "lua", "objective c",
+    # Web and frameworks
+    "react", "react native", "angular", "vue", "nextjs", "nuxtjs", "svelte", "redux",
+    "nodejs", "expressjs", "django", "flask", "fastapi", "spring boot",
+    "aspnet", "laravel", "rails", "ruby on rails", "graphql", "rest api", "grpc",
+    "jquery", "bootstrap", "tailwind", "webpack", "flutter",
+    # Data and ML
+    "machine learning", "deep learning", "artificial intelligence", "nlp",
+    "natural language processing", "computer vision", "data science", "data analysis",
+    "tensorflow", "pytorch", "keras", "scikit learn", "pandas", "numpy", "scipy",
+    "matplotlib", "opencv", "hugging face", "llm", "spark", "pyspark", "hadoop",
+    "airflow", "kafka", "dbt", "tableau", "power bi", "excel", "etl",
+    # Databases
+    "postgresql", "mysql", "sqlite", "mongodb", "redis", "cassandra", "dynamodb",
+    "elasticsearch", "oracle", "snowflake", "bigquery", "firebase",
+    # Cloud and DevOps
+    "aws", "aws lambda", "gcp", "azure", "docker", "kubernetes", "terraform", "ansible",
+    "jenkins", "ci/cd", "github actions", "gitlab ci", "helm", "prometheus", "grafana",
+    "linux", "nginx", "microservices", "serverless", "git", "jira",
+    # Testing and practices
+    "pytest", "junit", "selenium", "cypress", "jest", "agile", "scrum", "tdd",
+    # Abbreviations resolved through CANONICAL_MAP
+    "ml", "ai", "js", "reactjs", "react js", "node js",
+]
+
+# Alias dictionary loaded at import; see SkillNormalizer for plugging in another
+SYNONYMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skill_synonyms.csv")
+# Distinct raw skill strings remembered per normalizer
+NORMALIZE_CACHE_SIZE = 65536
+
+_WHITESPACE = re.compile(r"\s+")
+
+def _normalize(skill):
+    # Remove dots and commas (node.js → nodejs), hyphens to spaces (react-js → react js)
+    skill = skill.lower().strip().replace(".", "").replace(",", "").replace("-", " ")
+
+    # Collapse multiple spaces. Every whitespace character other than " "
+    # is unprintable, so the regex only runs when there is something to do.
+    if "  " in skill or not skill.isprintable():
+        skill = _WHITESPACE.sub(" ", skill)
+
+    # Fix common spacing issues around symbols
+    if "+" in skill or "#" in skill:
+        skill = skill.replace(" + +", "++").replace(" #", "#")
+
+    return skill
+
+def load_synonyms(path):
+    # Reads "alias,canonical" lines (or tab separated); blank lines, "#"
+    # comments and an "alias,canonical" header are skipped
+    synonyms = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            alias, sep, canonical = line.partition("\t" if "\t" in line else ",")
+            if not sep or alias.strip().lower() == "alias":
+                continue
+            synonyms[alias] = canonical
+    return synonyms
+
+class SkillNormalizer:
+    # Normalization plus alias lookup, compiled once. Every alias is
+    # normalized up front and chains (a -> b -> c) are resolved to their end,
+    # so canonicalizing is a single dict lookup. Results for raw strings are
+    # memoized in bounded LRU caches.
+    def __init__(self, synonyms=None, cache_size=NORMALIZE_CACHE_SIZE):
+        raw = dict(CANONICAL_MAP)
+        raw.update(synonyms or {})
+
+        table = {}
+        for alias, canonical in raw.items():
+            alias, canonical = _normalize(alias), _normalize(canonical)
+            if alias and canonical and alias != canonical:
+                table[alias] = canonical
+
+        # Follow chains to their end; a cycle stops where it would repeat
+        for alias in table:
+            seen, target = {alias}, table[alias]
+            while target in table and target not in seen:
+                seen.add(target)
+                target = table[target]
+            table[alias] = target
+        self.table = table
+
+        if cache_size:
+            self.normalize = lru_cache(maxsize=cache_size)(_normalize)
+            self.canonical = lru_cache(maxsize=cache_size)(self._canonical)
+        else:
+            self.normalize = _normalize
+            self.canonical = self._canonical
+
+    @classmethod
+    def from_file(cls, path, cache_size=NORMALIZE_CACHE_SIZE):
+        return cls(load_synonyms(path), cache_size)
+
+    def canonicalize(self, skill):
+        return self.table.get(skill, skill)
+
+    def _canonical(self, skill):
+        skill = _normalize(skill)
+        return self.table.get(skill, skill)
+
+_normalizer = SkillNormalizer.from_file(SYNONYMS_PATH) if os.path.exists(SYNONYMS_PATH) else SkillNormalizer()
+
+def get_normalizer():
+    return _normalizer
+
+def set_normalizer(normalizer):
+    # Swaps the process-wide normalizer, e.g. for a larger synonym file.
+    # Build SkillExtractors afterwards so their vocabulary uses it too.
+    global _normalizer
+    _normalizer = normalizer
+
+def normalize_skill(skill):
+    return _normalizer.normalize(skill)
+
+def canonicalize_skill(skill):
+    return _normalizer.canonicalize(skill)
+
+def canonical_skill(skill):
+    # canonicalize_skill(normalize_skill(skill)) in one memoized call
+    return _normalizer.canonical(skill)
+
+# Anything that is not part of a skill token becomes a word break. Dots are
+# dropped rather than split on, exactly as normalize_skill does (node.js → nodejs).
+_TOKEN_BREAK = re.compile(r"[^a-z0-9+#]+")
+
+def tokenize(text):
+    return _TOKEN_BREAK.split(text.lower().replace(".", ""))
+
+EXPERIENCE_PATTERN = re.compile(
+    r"(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)\b(?:\s+of)?(?:\s+(?:professional|industry|work))?\s+experience",
+    re.IGNORECASE
+)
+
+def estimate_experience(text):
+    # Largest "N years of experience" figure stated in the text, else 0.0
+    years = [float(match) for match in EXPERIENCE_PATTERN.findall(text)]
+    return round(max(years), 1) if years else 0.0
+
+class SkillExtractor:
+    # Offline skill matcher. Every vocabulary entry is compiled into a
+    # word-level trie, then resume text is scanned once left to right taking
+    # the longest match at each position. Output uses the same
+    # canonical_skill normalization as the LLM path.
+    def __init__(self, vocabulary=None):
+        self.trie = {}
+        self.max_words = 0
+        for surface in (vocabulary if vocabulary is not None else SKILL_VOCABULARY):
+            self.add(surface)
+
+    def add(self, surface):
+        words = [w for w in tokenize(surface) if w]
+        if not words:
+            return
+
+        node = self.trie
+        for word in words:
+            node = node.setdefault(word, {})
+        node[None] = canonical_skill(surface)
+        self.max_words = max(self.max_words, len(words))
+
+    def scan(self, text):
+        # Returns (skills in first-seen order, text with fully matched words
+        # removed). The leftover keeps the original wording so dates and
+        # figures like "2.5 years" survive for the LLM.
+        chunks = text.split()
+        words, origin = [], []
+        for index, chunk in enumerate(chunks):
+            for word in tokenize(chunk):
+                if word:
+                    words.append(word)
+                    origin.append(index)
+
+        skills, seen = [], set()
+        consumed = [0] * len(chunks)
+        i = 0
+        while i < len(words):
+            node, match, match_end = self.trie, None, i
+            j = i
+            while j < len(words) and j - i < self.max_words:
+                node = node.get(words[j])
+                if node is None:
+                    break
+                j += 1
+                if None in node:
+                    match, match_end = node[None], j
+
+            if match is None:
+                i += 1
+                continue
+
+            if match not in seen:
+                seen.add(match)
+                skills.append(match)
+            for k in range(i, match_end):
+                consumed[origin[k]] += 1
+            i = match_end
+
+        totals = [0] * len(chunks)
+        for index in origin:
+            totals[index] += 1
+        leftover = " ".join(
+            chunk for chunk, used, total in zip(chunks, consumed, totals)
+            if not total or used < total
+        )
+        return skills, leftover
+
+    def extract(self, text):
+        return self.scan(text)[0]
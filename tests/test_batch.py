@@ -0,0 +1,28 @@
+# test_batch.py
+# The batch CLI (CLI-Version/batch.py).
+import sys
+
+import llm
+
+from conftest import ROOT
+
+sys.path.insert(0, str(ROOT / "CLI-Version"))
+
+import batch
+
+
+def test_local_mode_makes_no_llm_calls(monkeypatch, tmp_path):
+    def no_client(*args, **kwargs):
+        raise AssertionError("local mode built an LLM client")
+
+    monkeypatch.setattr(llm, "make_client", no_client)
+    monkeypatch.setattr(llm, "_client", None)
+    out = tmp_path / "ranked.jsonl"
+
+    code = batch.main([
+        "--jd", str(ROOT / "test_data" / "Job_Description.txt"), str(ROOT / "test_data"),
+        "--mode", "local", "--no-cache", "--parse-workers", "0", "-o", str(out), "--format", "jsonl",
+    ])
+
+    assert code == batch.EXIT_OK
+    assert len(out.read_text().splitlines()) == 3
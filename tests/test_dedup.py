@@ -0,0 +1,46 @@
+# test_dedup.py
+# Duplicate grouping must never merge two different people: only exact
+# copies by default, and near-duplicates only when they list the same skills.
+from dedup import DuplicateDetector
+
+from bench_pipeline import synthetic_pdfs
+from test_pipeline import make_system, run_with_timeout
+
+TEMPLATE = (
+    "Jane Doe\\nSummary\\nBackend engineer who builds data platforms and APIs for retail "
+    "and logistics teams, with a focus on reliability and clear documentation.\\n"
+    "Experience\\nSenior engineer at Example Corp, led the migration of batch jobs to "
+    "streaming pipelines and mentored four developers across two teams.\\n"
+    "Skills\\n{skills}\\n"
+).replace("\\n", "\n")
+
+
+def test_near_duplicates_need_the_same_skills():
+    detector = DuplicateDetector(0.5)
+    assert detector.check("a", text=TEMPLATE.format(skills="python, docker, kafka")) is None
+    assert detector.check("b", text=TEMPLATE.format(skills="java, spring, oracle")) is None
+    edited = TEMPLATE.format(skills="python, docker, kafka").replace("four", "five")
+    assert detector.check("c", text=edited) == ("a", "near")
+
+
+def test_near_duplicates_are_off_by_default():
+    detector = DuplicateDetector(None)
+    text = TEMPLATE.format(skills="python, docker, kafka")
+    assert detector.check("a", text=text) is None
+    assert detector.check("b", text=text.replace("four", "five")) is None
+    assert detector.check("c", text=text) == ("a", "exact")
+
+
+def test_template_resumes_are_all_ranked():
+    pdfs = synthetic_pdfs(20)
+    system = make_system()
+
+    processed = run_with_timeout(lambda: system.process_resumes(pdfs))
+
+    assert len(processed) == len(system.resumes) == len(pdfs)
+    assert all(resume.duplicate_of is None for resume in processed)
+
+    # Opting in to near-duplicates still keeps people with other skills apart
+    system = make_system(dedup_threshold=0.8)
+    processed = run_with_timeout(lambda: system.process_resumes(pdfs))
+    assert len(system.resumes) == len(pdfs)
@@ -0,0 +1,79 @@
+# test_job_store.py
+# Batches recorded in a JobStore survive a run that dies part way and can
+# be resumed where they stopped.
+import pytest
+
+from job_store import JobStore
+
+from test_pipeline import PDFS, make_system, run_with_timeout
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_results_are_stored_before_the_batch_ends(store, tmp_path):
+    system = make_system(job_store=store, dedup=False)
+    # Fails only once every resume has come off the pipeline
+    system.metrics_log = str(tmp_path / "missing" / "metrics.jsonl")
+
+    with pytest.raises(FileNotFoundError):
+        run_with_timeout(lambda: system.process_resumes(PDFS))
+
+    # Left unfinished and released, so it is offered for resuming at once
+    job = store.unfinished_jobs()[0]
+    assert job["done"] == len(PDFS)
+    assert job["pending"] == 0
+
+
+def test_running_jobs_are_not_offered_until_their_lease_ends(store):
+    job_id = store.create_job("python", ["python"], 0.0, [(0, "a.pdf", "a.pdf")])
+    assert store.unfinished_jobs() == []
+    assert not store.claim(job_id)
+
+    store.release(job_id)
+    assert [job["id"] for job in store.unfinished_jobs()] == [job_id]
+    assert store.claim(job_id)
+    # Only one session gets it
+    assert not store.claim(job_id)
+    assert store.unfinished_jobs() == []
+
+
+def test_resuming_a_job_with_nothing_pending_finishes_it(store):
+    job_id = store.create_job("python", ["python"], 1.0, [(0, "a.pdf", "a.pdf")])
+    store.mark_done(job_id, 0, ["python"], 3.0)
+    store.release(job_id)
+    system = make_system(job_store=store)
+
+    assert system.resume_job(job_id) == []
+
+    assert store.get_job(job_id)["status"] == "finished"
+    assert system.job_id is None
+    assert system.job.client is system.client
+    assert [resume.name for resume in system.resumes] == ["a.pdf"]
+
+
+def test_duplicates_are_stored_and_regrouped_on_resume(store):
+    system = make_system(job_store=store)
+    run_with_timeout(lambda: system.process_resumes(PDFS + [PDFS[0]]))
+
+    results = store.results(1)
+    assert [row[4] for row in results] == [None] * len(PDFS) + [0]
+
+    # Reopen it as if the session had died with one resume still pending
+    store.create_job("python docker", ["python", "docker"], 2.0, [
+        (position, name, "missing.pdf") for position, name, _, _, _ in results
+    ] + [(len(results), "late.pdf", PDFS[1])])
+    for position, _, skills, experience, duplicate_of in results:
+        store.mark_done(2, position, skills, experience, duplicate_of=duplicate_of)
+    store.release(2)
+
+    system = make_system(job_store=store)
+    assert system.resume_job(2) == [("late.pdf", PDFS[1])]
+    names = [resume.name for resume in system.resumes]
+    assert len(names) == len(PDFS)
+    first = system.resumes[0]
+    assert first.duplicates == [results[-1][1]]
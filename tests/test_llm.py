@@ -0,0 +1,119 @@
+# test_llm.py
+# Retry policy of LLMCaller: only transient errors are retried, and retries
+# and hedges take request slots from the rate limiter.
+import time
+
+import pytest
+
+from classes import RateLimiter
+from llm import DeadlineExceeded, LLMCaller, is_retryable
+from metrics import Metrics
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class APIConnectionError(Exception):
+    pass
+
+
+class _Completions:
+    def __init__(self, client):
+        self._client = client
+
+    def create(self, **request):
+        return self._client.answer()
+
+
+class _Chat:
+    def __init__(self, client):
+        self.completions = _Completions(client)
+
+
+class ScriptedClient:
+    # Raises the given errors in turn, then answers "ok"; `delay` slows
+    # every call down so hedges fire
+    def __init__(self, *errors, delay=0.0):
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = 0
+        self.chat = _Chat(self)
+
+    def answer(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class CountingLimiter(RateLimiter):
+    def __init__(self, requests_per_minute):
+        super().__init__(requests_per_minute)
+        self.waits = 0
+
+    def wait(self, deadline=None):
+        self.waits += 1
+        super().wait(deadline)
+
+
+@pytest.mark.parametrize("error, retryable", [
+    (TimeoutError(), True),
+    (ConnectionError(), True),
+    (APIConnectionError(), True),
+    (StatusError(429), True),
+    (StatusError(503), True),
+    (StatusError(400), False),
+    (StatusError(401), False),
+    (ValueError(), False),
+])
+def test_is_retryable(error, retryable):
+    assert is_retryable(error) is retryable
+
+
+def test_client_errors_are_not_retried():
+    client = ScriptedClient(StatusError(401))
+    caller = LLMCaller(max_retries=3, backoff=0)
+    with pytest.raises(StatusError):
+        caller.call(client)
+    assert client.calls == 1
+
+
+def test_transient_errors_are_retried_through_the_limiter():
+    client = ScriptedClient(StatusError(503), StatusError(429))
+    limiter = CountingLimiter(60_000)
+    metrics = Metrics()
+    caller = LLMCaller(max_retries=3, backoff=0)
+    assert caller.call(client, metrics=metrics, limiter=limiter) == "ok"
+    assert client.calls == 3
+    # The first attempt's slot is the caller's; each retry takes its own
+    assert limiter.waits == 2
+    assert metrics.counters["llm_retries"] == 2
+
+
+def test_retry_without_a_slot_before_the_deadline_fails_fast():
+    client = ScriptedClient(StatusError(503))
+    limiter = RateLimiter(1)
+    limiter.wait()
+    caller = LLMCaller(max_retries=3, backoff=0)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        caller.call(client, deadline=time.monotonic() + 1.0, limiter=limiter)
+    assert time.monotonic() - start < 0.5
+    assert client.calls == 1
+
+
+def test_hedge_needs_a_free_slot():
+    caller = LLMCaller(hedge_after=0.05)
+    limiter = RateLimiter(1)
+    limiter.wait()
+    client = ScriptedClient(delay=0.2)
+    assert caller.call(client, limiter=limiter) == "ok"
+    assert client.calls == 1
+
+    client = ScriptedClient(delay=0.2)
+    assert caller.call(client, limiter=RateLimiter(60_000)) == "ok"
+    assert client.calls == 2
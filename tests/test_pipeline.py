@@ -0,0 +1,229 @@
+# test_pipeline.py
+# Failure paths of the extraction pipeline: whatever raises, every resume
+# must come back exactly once (as a Resume or a ResumeError) and
+# process_resumes must return.
+import os
+import glob
+import threading
+
+import pytest
+
+import classes
+from classes import JobDescription, ResumeError, ResumeRankingSystem
+
+from conftest import ROOT
+from fake_groq import FakeGroq
+
+PDFS = sorted(glob.glob(str(ROOT / "test_data" / "*.pdf")))
+TIMEOUT = 60
+
+
+def crash_worker(*args, **kwargs):
+    # Kills the parse worker process the way a native crash or OOM kill does
+    os._exit(1)
+
+
+def make_system(**kwargs):
+    kwargs = {"extraction_mode": "local", "parse_workers": 0, "client": FakeGroq(), **kwargs}
+    system = ResumeRankingSystem(**kwargs)
+    system.job = JobDescription(client=system.client)
+    system.job.skills = ["python", "docker"]
+    system.job.required_experience = 2.0
+    return system
+
+
+def run_with_timeout(func):
+    # Runs func in a thread and fails the test instead of hanging the suite
+    result = {}
+
+    def target():
+        try:
+            result["value"] = func()
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(TIMEOUT)
+    assert not thread.is_alive(), "pipeline hung"
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+def test_broken_parse_pool_fails_every_resume(monkeypatch):
+    monkeypatch.setattr(classes, "extract_pdf_text_timed", crash_worker)
+    # Enough files that some are still to be submitted once the pool breaks
+    inputs = PDFS * 4
+    system = make_system(parse_workers=1, dedup=False)
+
+    items = run_with_timeout(lambda: list(system.iter_process_resumes(inputs)))
+
+    assert len(items) == len(inputs)
+    assert all(isinstance(item, ResumeError) for item in items)
+    assert system.resumes == []
+
+
+def test_duplicate_check_error_fails_only_that_resume(monkeypatch):
+    import dedup
+
+    def broken_check(self, item, digest=None, text=None):
+        if text is not None and item.name == os.path.basename(PDFS[0]):
+            raise RuntimeError("dedup failed")
+        return None
+
+    monkeypatch.setattr(dedup.DuplicateDetector, "check", broken_check)
+    system = make_system()
+
+    items = run_with_timeout(lambda: list(system.iter_process_resumes(PDFS)))
+
+    errors = [item for item in items if isinstance(item, ResumeError)]
+    assert [e.name for e in errors] == [os.path.basename(PDFS[0])]
+    assert len(system.resumes) == len(PDFS) - 1
+
+
+class LockedCache:
+    # ExtractionCache stand-in whose writes fail like a locked SQLite file
+    hits = misses = 0
+
+    make_key = staticmethod(lambda data, prompt, model: prompt[:8] + str(len(data)))
+
+    def get(self, key):
+        return None
+
+    def put(self, key, skills, experience):
+        import sqlite3
+        raise sqlite3.OperationalError("database is locked")
+
+
+@pytest.mark.parametrize("batch_token_budget", [None, 100_000])
+def test_cache_write_error_keeps_the_result(batch_token_budget):
+    system = make_system(extraction_mode="llm", cache=LockedCache(), batch_token_budget=batch_token_budget)
+
+    processed = run_with_timeout(lambda: system.process_resumes(PDFS))
+
+    assert len(processed) == len(PDFS)
+    assert system.batch_metrics.counters["cache_errors"] == len(PDFS)
+
+
+def test_batched_extraction_error_fails_the_batch(monkeypatch):
+    system = make_system(extraction_mode="llm", batch_token_budget=100_000)
+
+    def broken_finish(task, skills, experience):
+        raise RuntimeError("cannot finish")
+
+    monkeypatch.setattr(system, "_finish_task", broken_finish)
+
+    items = run_with_timeout(lambda: list(system.iter_process_resumes(PDFS)))
+
+    assert len(items) == len(PDFS)
+    assert all(isinstance(item, ResumeError) for item in items)
+
+
+def test_llm_stage_preparation_error_fails_only_that_resume(monkeypatch):
+    system = make_system(extraction_mode="prefill")
+    real_scan = system.skill_extractor.scan
+    calls = []
+
+    def scan(text):
+        calls.append(text)
+        if len(calls) == 1:
+            raise ValueError("bad text")
+        return real_scan(text)
+
+    monkeypatch.setattr(system.skill_extractor, "scan", scan)
+
+    items = run_with_timeout(lambda: list(system.iter_process_resumes(PDFS)))
+
+    assert len(items) == len(PDFS)
+    assert sum(isinstance(item, ResumeError) for item in items) == 1
+
+
+def test_batch_deadline_is_not_stretched_by_the_rate_limit(tmp_path):
+    import time
+    from job_store import JobStore
+    from llm import DeadlineExceeded
+
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    inputs = PDFS * 4
+    system = make_system(
+        extraction_mode="llm", requests_per_minute=60, batch_deadline=2, dedup=False, job_store=store
+    )
+    system.job.raw_text = "python docker"
+
+    start = time.monotonic()
+    items = run_with_timeout(lambda: list(system.iter_process_resumes(inputs)))
+    elapsed = time.monotonic() - start
+
+    late = [item for item in items if isinstance(item, ResumeError)]
+    assert elapsed < 4
+    assert late and all(isinstance(item.exception, DeadlineExceeded) for item in late)
+    # Left pending and unfinished, so the job can be resumed
+    job = store.unfinished_jobs()[0]
+    assert job["pending"] == len(late)
+    assert job["done"] == len(inputs) - len(late)
+
+
+def test_closing_the_stream_stops_the_pipeline():
+    import time
+
+    client = FakeGroq(latency=0.05)
+    inputs = PDFS * 10
+    system = make_system(extraction_mode="llm", client=client, concurrency=2, dedup=False)
+    before = set(threading.enumerate())
+
+    stream = system.iter_process_resumes(inputs)
+    next(stream)
+    stream.close()
+    time.sleep(0.5)
+    calls = client.calls
+    time.sleep(0.5)
+
+    # At most the first round of calls and the ones running when it was closed
+    assert calls <= 2 * 2
+    assert client.calls == calls
+    assert [t for t in threading.enumerate() if t not in before and t.is_alive()] == []
+
+
+def test_pool_keeps_input_order_whatever_finishes_first():
+    # Copies under distinct names tie on score, so only the pool order
+    # decides how they rank
+    with open(PDFS[0], "rb") as f:
+        data = f.read()
+    inputs = [(f"copy_{i}.pdf", data) for i in range(8)] + PDFS
+    names = [f"copy_{i}.pdf" for i in range(8)] + [os.path.basename(p) for p in PDFS]
+
+    rankings = set()
+    for seed in range(4):
+        client = FakeGroq(latency=0.01, jitter=0.01, seed=seed)
+        system = make_system(extraction_mode="llm", client=client, concurrency=4, dedup=False)
+        processed = run_with_timeout(lambda: system.process_resumes(inputs))
+
+        assert [resume.name for resume in processed] == names
+        assert [resume.name for resume in system.resumes] == names
+        rankings.add(tuple(resume.name for resume in system.calculate_scores()))
+    assert len(rankings) == 1
+
+
+def test_slow_llm_stage_holds_parsing_back(monkeypatch):
+    import time
+
+    parsed = []
+    real_extract = classes.extract_pdf_text_timed
+
+    def counting_extract(*args):
+        parsed.append(1)
+        return real_extract(*args)
+
+    monkeypatch.setattr(classes, "extract_pdf_text_timed", counting_extract)
+    client = FakeGroq(latency=0.05)
+    system = make_system(extraction_mode="llm", client=client, concurrency=1, queue_size=2, dedup=False)
+
+    stream = system.iter_process_resumes(PDFS * 20)
+    next(stream)
+    time.sleep(0.5)
+    # Running and waiting calls, the full queue and the files being parsed
+    ahead = len(parsed) - client.calls
+    stream.close()
+
+    assert ahead <= (1 + 2) + 2 + 2 + 1